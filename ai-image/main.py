@@ -6,10 +6,21 @@ Generate images using OpenAI's gpt-image-1 model with customizable styles and th
 
 import os
 import sys
-import base64
+import re
+import asyncio
+import binascii
+import functools
+import hashlib
+import shutil
+import tempfile
 from pathlib import Path
+from typing import TYPE_CHECKING
 import click
-from openai import OpenAI
+import orjson
+
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncOpenAI
 
 
 # Image style configurations (aspect ratio)
@@ -21,92 +32,529 @@ STYLES = {
 }
 
 # Theme descriptions for prompt engineering
+# Kept terse: each word is billed as an input token on every request, so only
+# the style cues the model actually keys on are included.
 THEMES = {
-    "ghibli": "in the style of Studio Ghibli animation, whimsical and dreamlike with soft colors and hand-drawn aesthetic",
-    "futuristic": "in a futuristic sci-fi style with sleek designs, neon lights, and advanced technology",
-    "pixar": "in Pixar animation style with vibrant colors, expressive characters, and polished 3D rendering",
-    "oil-paint": "as an oil painting with rich textures, visible brushstrokes, and classical artistic composition",
-    "chinese-paint": "in traditional Chinese ink painting style with delicate brushwork, minimalist composition, and ethereal atmosphere"
+    "ghibli": "Studio Ghibli style, whimsical, dreamlike, soft colors, hand-drawn",
+    "futuristic": "futuristic sci-fi style, sleek design, neon lights, advanced tech",
+    "pixar": "Pixar 3D animation style, vibrant colors, expressive characters",
+    "oil-paint": "oil painting, rich texture, visible brushstrokes, classical composition",
+    "chinese-paint": "traditional Chinese ink painting, delicate brushwork, minimalist, ethereal"
 }
 
 
+def _identity(prompt: str) -> str:
+    """Return the prompt unchanged (no theme)."""
+    return prompt
+
+
+def _theme_enhancer(description: str):
+    """Build a prompt enhancer with the theme suffix pre-bound."""
+    suffix = f", {description}"
+    return lambda prompt: prompt + suffix
+
+
+# One specialized enhancer per theme, built once at import
+_ENHANCERS = {name: _theme_enhancer(description) for name, description in THEMES.items()}
+
+
 def enhance_prompt(prompt: str, theme: str = None) -> str:
     """Enhance the user prompt with theme description if specified."""
-    if theme and theme in THEMES:
-        return f"{prompt}, {THEMES[theme]}"
-    return prompt
+    return _ENHANCERS.get(theme, _identity)(prompt)
 
 
-def generate_image(prompt: str, style: str, theme: str, output: str):
-    """Generate an image using OpenAI's gpt-image-1 model."""
+def output_paths(output: str, count: int) -> list[Path]:
+    """Return the output path for each generated image, numbered when count > 1."""
+    output_path = Path(output)
+    if count == 1:
+        return [output_path]
+    return [output_path.with_stem(f"{output_path.stem}_{i}") for i in range(1, count + 1)]
 
-    # Check for API key
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        click.echo(click.style("Error: OPENAI_API_KEY environment variable not set", fg="red"), err=True)
-        click.echo("Please set your OpenAI API key: export OPENAI_API_KEY='your-key-here'", err=True)
-        sys.exit(1)
 
-    # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
+# Status output goes straight to the streams; ANSI codes are chosen once at
+# startup from whether each stream is a terminal.
+_TTY = sys.stdout.isatty()
+_RESET = "\x1b[0m" if _TTY else ""
+_CYAN = "\x1b[36m" if _TTY else ""
+_BLUE = "\x1b[34m" if _TTY else ""
+_YELLOW = "\x1b[33m" if _TTY else ""
+_OK = "\x1b[1;32m" if _TTY else ""
+_ERR_TTY = sys.stderr.isatty()
+_RED_ERR = "\x1b[31m" if _ERR_TTY else ""
+_YELLOW_ERR = "\x1b[33m" if _ERR_TTY else ""
+_RESET_ERR = "\x1b[0m" if _ERR_TTY else ""
 
-    # Enhance prompt with theme
-    enhanced_prompt = enhance_prompt(prompt, theme)
-    size = STYLES[style]
 
-    click.echo(click.style("Generating image...", fg="cyan"))
-    click.echo(f"Prompt: {enhanced_prompt}")
-    click.echo(f"Size: {size}")
+def _info(msg: str, color: str = "") -> None:
+    """Write a status line to stdout, optionally colored."""
+    sys.stdout.write(f"{color}{msg}{_RESET}\n" if color else f"{msg}\n")
+
+
+def _ok(msg: str) -> None:
+    """Write a success line to stdout."""
+    _info(msg, _OK)
+
+
+def _error(msg: str, color: str = _RED_ERR) -> None:
+    """Write an error line to stderr, red by default."""
+    sys.stderr.write(f"{color}{msg}{_RESET_ERR}\n" if color else f"{msg}\n")
+
+
+def _warn(msg: str) -> None:
+    """Write a warning line to stderr, in yellow."""
+    _error(msg, _YELLOW_ERR)
+
+
+def _client(api_key: str, http: "httpx.AsyncClient") -> "AsyncOpenAI":
+    """Return an OpenAI client that sends its requests through http.
+
+    The SDK is imported here so --help, argument errors and --fast runs never
+    pay for it.
+    """
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=api_key, http_client=http)
+
+
+def _http_client() -> "httpx.AsyncClient":
+    """Return the HTTP client for one run's API calls and image downloads.
+
+    The caller closes it when the run ends. HTTP/2 lets concurrent generations for several prompts share one
+    TCP+TLS connection. httpx is imported on first use, so --help and
+    argument errors don't pay for it.
+
+    The read timeout matches the SDK's own 600s default: a batch of
+    gpt-image-1 images can take minutes, and the SDK retries a timed-out
+    request, so a shorter one would mean paying for the same batch again.
+    """
+    import httpx
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+        timeout=httpx.Timeout(600.0, connect=10.0),
+    )
+
+
+def _images_url() -> str:
+    """Return the images endpoint, honouring OPENAI_BASE_URL like the SDK does."""
+    base_url = os.environ.get("OPENAI_BASE_URL") or "https://api.openai.com/v1"
+    return base_url.rstrip("/") + "/images/generations"
+
 
+# Generated images are cached by (prompt, size, variant index) so identical
+# requests are served from disk instead of the API
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "ai-image"
+
+
+# Write images in fixed-size pieces instead of materializing the whole file.
+# The base64 slice length is a multiple of 4, so every slice decodes on its own.
+CHUNK_SIZE = 64 * 1024
+
+
+# Images are written through a raw file descriptor, skipping Python's
+# buffered IO layer (and its extra copy) for multi-MB payloads.
+_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write all of data to fd, retrying on short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _write_b64(b64_json: str, output_path: Path) -> None:
+    """Decode base64 image data straight into a file, one slice at a time."""
+    fd = os.open(output_path, _OPEN_FLAGS, 0o644)
     try:
-        # Generate image using gpt-image-1
-        # Note: gpt-image-1 returns b64_json format, not URLs
-        response = client.images.generate(
+        for start in range(0, len(b64_json), CHUNK_SIZE):
+            _write_all(fd, binascii.a2b_base64(b64_json[start:start + CHUNK_SIZE]))
+    finally:
+        os.close(fd)
+
+
+async def _download(http: "httpx.AsyncClient", url: str, output_path: Path) -> None:
+    """Stream an image from a URL to a file without blocking the event loop."""
+    async with http.stream("GET", url) as response:
+        response.raise_for_status()
+        fd = os.open(output_path, _OPEN_FLAGS, 0o644)
+        try:
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                _write_all(fd, chunk)
+        finally:
+            os.close(fd)
+
+
+async def _save_image(http: "httpx.AsyncClient", image, output_path: Path) -> Path:
+    """Write one image from an API response to its output path."""
+    # Get the base64 encoded image
+    # gpt-image-1 returns images as base64 encoded data
+    b64_json = getattr(image, 'b64_json', None)
+    url = getattr(image, 'url', None)
+    if b64_json:
+        # Decode and write on a worker thread so other requests keep flowing
+        await asyncio.to_thread(_write_b64, b64_json, output_path)
+    elif url:
+        # Fallback to URL if b64_json is not available
+        await _download(http, url, output_path)
+    else:
+        raise Exception("No image data received from API")
+    return output_path
+
+
+async def _save_images(http: "httpx.AsyncClient", response, paths: list[Path]) -> list[Path]:
+    """Write every image in an API response to its output path concurrently."""
+    return list(await asyncio.gather(*(
+        _save_image(http, image, output_path)
+        for image, output_path in zip(response.data, paths)
+    )))
+
+
+async def _request_sdk(client: "AsyncOpenAI", http: "httpx.AsyncClient", paths: list[Path],
+                       **params) -> tuple[int, str | None]:
+    """Generate images through the SDK and save them to paths.
+
+    Returns how many images were written and the model's revised prompt.
+    """
+    response = await client.images.generate(**params)
+    await _save_images(http, response, paths)
+    return len(response.data), getattr(response.data[0], 'revised_prompt', None)
+
+
+# Opening of a JSON string value after a key: optional whitespace, ':', '"'
+_VALUE_START = re.compile(rb'\s*:\s*"')
+# What may follow a key while the value's opening quote is still in flight
+_VALUE_PENDING = re.compile(rb'\s*(?::\s*)?')
+
+
+class _B64Extractor:
+    """Split a streamed images response into image files and a small JSON skeleton.
+
+    Each "b64_json" string is decoded in 4-character-aligned pieces and written
+    to the next output path while the body is still arriving, so base64
+    decoding overlaps the network transfer. Everything else accumulates in
+    `skeleton`, with those strings blanked, and is parsed once at the end.
+    """
+
+    KEY = b'"b64_json"'
+
+    def __init__(self, paths: list[Path]):
+        self.paths = paths
+        self.saved: list[Path] = []
+        self.skeleton = bytearray()
+        self._buffer = bytearray()
+        self._pending = bytearray()
+        self._in_value = False
+        self._fd = None
+
+    def feed(self, chunk: bytes) -> None:
+        """Consume the next chunk of the response body."""
+        buffer = self._buffer
+        buffer += chunk
+        while buffer:
+            if self._in_value:
+                end = buffer.find(b'"')
+                stop = len(buffer) if end < 0 else end
+                if buffer.find(b"\\", 0, stop) >= 0:
+                    # JSON may escape '/' as '\/'; base64 itself never contains '\'
+                    self._decode(bytes(buffer[:stop]).replace(b"\\", b""), end >= 0)
+                else:
+                    with memoryview(buffer)[:stop] as value:
+                        self._decode(value, end >= 0)
+                if end < 0:
+                    buffer.clear()
+                    return
+                del buffer[:end + 1]
+                self.skeleton += b'"'
+                self._end_value()
+                continue
+
+            start = buffer.find(self.KEY)
+            if start < 0:
+                # Hold back a tail in case the key straddles two chunks
+                cut = max(len(buffer) - len(self.KEY) + 1, 0)
+                self.skeleton += buffer[:cut]
+                del buffer[:cut]
+                return
+
+            pos = start + len(self.KEY)
+            match = _VALUE_START.match(buffer, pos)
+            if match is None:
+                if _VALUE_PENDING.fullmatch(buffer, pos):
+                    # The opening quote has not arrived yet
+                    self.skeleton += buffer[:start]
+                    del buffer[:start]
+                    return
+                # "b64_json" appeared as something other than a key
+                self.skeleton += buffer[:pos]
+                del buffer[:pos]
+                continue
+
+            self.skeleton += buffer[:match.end()]
+            del buffer[:match.end()]
+            self._start_value()
+
+    def _start_value(self) -> None:
+        self._in_value = True
+        index = len(self.saved)
+        if index < len(self.paths):
+            self._fd = os.open(self.paths[index], _OPEN_FLAGS, 0o644)
+
+    def _end_value(self) -> None:
+        self._in_value = False
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self.saved.append(self.paths[len(self.saved)])
+
+    def _decode(self, data: bytes | memoryview, final: bool) -> None:
+        # One pending buffer is reused for the whole response: base64 is
+        # appended in place and decoded straight from a view of it, instead
+        # of building a fresh carry + chunk bytes object for every chunk.
+        pending = self._pending
+        pending += data
+        aligned = len(pending) if final else len(pending) - len(pending) % 4
+        if aligned and self._fd is not None:
+            with memoryview(pending)[:aligned] as view:
+                _write_all(self._fd, binascii.a2b_base64(view))
+        del pending[:aligned]
+
+    def finish(self) -> dict:
+        """Parse and return the response skeleton once the body has ended."""
+        if self._in_value:
+            raise Exception("Image data in API response was truncated")
+        self.skeleton += self._buffer
+        return orjson.loads(self.skeleton)
+
+    def close(self) -> None:
+        """Release the file of an image left incomplete by an error."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+async def _request_raw(http: "httpx.AsyncClient", api_key: str, paths: list[Path],
+                       **params) -> tuple[int, str | None]:
+    """Call the images endpoint directly, decoding images while they stream in.
+
+    This skips the SDK entirely: the multi-MB b64_json strings are never
+    validated by pydantic or even held in memory, and decoding overlaps the
+    download. Returns how many images were written and the revised prompt.
+    """
+    extractor = _B64Extractor(paths)
+    try:
+        async with http.stream(
+            "POST",
+            _images_url(),
+            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+            content=orjson.dumps(params),
+        ) as response:
+            if response.is_error:
+                await response.aread()
+                try:
+                    message = orjson.loads(response.content)["error"]["message"]
+                except (orjson.JSONDecodeError, KeyError, TypeError):
+                    message = response.text
+                raise Exception(f"Error code: {response.status_code} - {message}")
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                extractor.feed(chunk)
+    finally:
+        extractor.close()
+
+    images = extractor.finish()["data"]
+    written = len(extractor.saved)
+    if not written:
+        # Fallback to URLs if b64_json is not available
+        urls = [image["url"] for image in images if image.get("url")]
+        if not urls:
+            raise Exception("No image data received from API")
+        await asyncio.gather(*(_download(http, url, path) for url, path in zip(urls, paths)))
+        written = min(len(urls), len(paths))
+    return written, images[0].get("revised_prompt") if images else None
+
+
+def _cache_path(enhanced_prompt: str, size: str, index: int) -> Path:
+    """Return the cache file for the index-th image of a prompt at a given size."""
+    key = hashlib.blake2b(f"{enhanced_prompt}|{size}|{index}".encode(), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{key}.png"
+
+
+def _copy_replace(source: Path, destination: Path) -> None:
+    """Copy source to destination through a temporary file in the same directory.
+
+    The copy is moved into place with os.replace, so destination is either
+    a complete image or absent: an interrupted copy can't leave a truncated
+    cache entry behind, and two runs storing the same key don't interleave.
+    """
+    fd, tmp = tempfile.mkstemp(dir=destination.parent, prefix=f"{destination.stem}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, destination)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+async def _copy_cache(source: Path, destination: Path, copy=shutil.copyfile) -> bool:
+    """Copy an image into or out of the cache; warn and return False if that fails.
+
+    The cache is an optimization: an unwritable or broken cache directory
+    (say, a read-only home in a sandbox) must not fail a run.
+    """
+    try:
+        await asyncio.to_thread(copy, source, destination)
+    except OSError as e:
+        _warn(f"Skipping image cache: {e}")
+        return False
+    return True
+
+
+async def _generate(request, enhanced_prompt: str, size: str, paths: list[Path], use_cache: bool):
+    """Produce the images for one prompt, serving what it can from the cache.
+
+    `request` generates images into the given paths: _request_sdk or _request_raw.
+
+    Returns the saved paths, how many came from the cache, and the model's
+    revised prompt (if a request was made and the model rewrote the prompt).
+    """
+    cache_paths = [_cache_path(enhanced_prompt, size, i) for i in range(len(paths))]
+    hits = [i for i, cache_path in enumerate(cache_paths) if use_cache and cache_path.exists()]
+    # A cached image that can't be copied out is generated again
+    copied = await asyncio.gather(*(_copy_cache(cache_paths[i], paths[i]) for i in hits))
+    hits = [i for i, ok in zip(hits, copied) if ok]
+    pending = [i for i in range(len(paths)) if i not in hits]
+
+    done = set(hits)
+    revised_prompt = None
+    if pending:
+        # Only the images missing from the cache are requested, batched
+        # server side in a single call.
+        # Note: gpt-image-1 always returns b64_json and rejects the
+        # response_format parameter, so URL mode cannot be requested here;
+        # the streaming URL path only serves models that return URLs.
+        count, revised_prompt = await request(
+            [paths[i] for i in pending],
             model="gpt-image-1",
             prompt=enhanced_prompt,
             size=size,
-            n=1,
+            n=len(pending),
         )
+        written = pending[:count]
 
-        # Get the base64 encoded image
-        # gpt-image-1 returns images as base64 encoded data
-        if hasattr(response.data[0], 'b64_json') and response.data[0].b64_json:
-            image_data = base64.b64decode(response.data[0].b64_json)
-        elif hasattr(response.data[0], 'url') and response.data[0].url:
-            # Fallback to URL if b64_json is not available
-            import httpx
-            image_data = httpx.get(response.data[0].url).content
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            _warn(f"Skipping image cache: {e}")
         else:
-            raise Exception("No image data received from API")
-
-        # Ensure output directory exists
-        output_path = Path(output)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.gather(*(
+                _copy_cache(paths[i], cache_paths[i], copy=_copy_replace) for i in written
+            ))
+        done.update(written)
 
-        # Save the image
-        with open(output_path, "wb") as f:
-            f.write(image_data)
+    return [paths[i] for i in sorted(done)], len(hits), revised_prompt
 
-        click.echo()
-        click.echo(click.style("✓ Image generated successfully!", fg="green", bold=True))
-        click.echo(f"Saved to: {click.style(str(output_path.absolute()), fg='blue')}")
 
-        # Print the revised prompt if the model modified it
-        if hasattr(response.data[0], 'revised_prompt') and response.data[0].revised_prompt:
-            click.echo()
-            click.echo(click.style("Revised prompt:", fg="yellow"))
-            click.echo(response.data[0].revised_prompt)
+async def generate_image_async(prompts: list[str], style: str, theme: str, output: str,
+                               count: int = 1, use_cache: bool = True, fast: bool = False,
+                               api_key: str | None = None):
+    """Generate images for all prompts concurrently using OpenAI's gpt-image-1 model."""
 
-    except Exception as e:
-        click.echo(click.style(f"Error generating image: {str(e)}", fg="red"), err=True)
+    # Check for API key (the CLI has already resolved it from the environment)
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        _error("Error: OPENAI_API_KEY environment variable not set")
+        _error("Please set your OpenAI API key: export OPENAI_API_KEY='your-key-here'", color="")
         sys.exit(1)
 
+    # Enhance prompts with theme
+    enhanced_prompts = [enhance_prompt(prompt, theme) for prompt in prompts]
+    size = STYLES[style]
+
+    _info("Generating image...", _CYAN)
+    for enhanced_prompt in enhanced_prompts:
+        _info(f"Prompt: {enhanced_prompt}")
+    _info(f"Size: {size}")
+    if count > 1:
+        _info(f"Count: {count}")
+
+    # One HTTP client for the whole run, shared by the SDK, --fast requests
+    # and downloads, and closed with its connections when the run ends
+    async with _http_client() as http:
+        if fast:
+            # Raw HTTP, decoding images as the response streams in
+            request = functools.partial(_request_raw, http, api_key)
+        else:
+            request = functools.partial(_request_sdk, _client(api_key, http), http)
+
+        try:
+            # Ensure output directory exists
+            paths = output_paths(output, len(prompts) * count)
+            paths[0].parent.mkdir(parents=True, exist_ok=True)
+
+            # One request per prompt, all in flight at once; each prompt owns a
+            # contiguous run of `count` numbered paths.
+            results = await asyncio.gather(*(
+                _generate(request, enhanced_prompt, size, paths[i * count:(i + 1) * count], use_cache)
+                for i, enhanced_prompt in enumerate(enhanced_prompts)
+            ))
+            saved = [path for run, _, _ in results for path in run]
+            cached = sum(hits for _, hits, _ in results)
+
+            _info("")
+            if len(saved) == 1:
+                _ok("✓ Image generated successfully!")
+            else:
+                _ok(f"✓ {len(saved)} images generated successfully!")
+            if cached:
+                _info(f"Reused {cached} cached image(s) from {CACHE_DIR}")
+            # Every output shares one directory, so resolve it against the cwd once
+            directory = paths[0].parent.absolute()
+            for output_path in saved:
+                _info(f"Saved to: {_BLUE}{directory / output_path.name}{_RESET}")
+
+            # Print the revised prompt if the model modified it
+            for _, _, revised_prompt in results:
+                if revised_prompt:
+                    _info("")
+                    _info("Revised prompt:", _YELLOW)
+                    _info(revised_prompt)
+
+        except Exception as e:
+            _error(f"Error generating image: {str(e)}")
+            sys.exit(1)
+
+
+def generate_image(prompt: str | list[str], style: str, theme: str, output: str,
+                   count: int = 1, use_cache: bool = True, fast: bool = False,
+                   api_key: str | None = None):
+    """Generate images using OpenAI's gpt-image-1 model."""
+    prompts = [prompt] if isinstance(prompt, str) else list(prompt)
+    asyncio.run(generate_image_async(prompts, style, theme, output, count, use_cache, fast, api_key))
+
+
+def _require_api_key(ctx, param, value):
+    """Fail during argument parsing, before any API work starts, if no key is set."""
+    if not value:
+        raise click.UsageError(
+            "OPENAI_API_KEY environment variable not set. "
+            "Please set your OpenAI API key: export OPENAI_API_KEY='your-key-here'"
+        )
+    return value
+
 
 @click.command()
+@click.option(
+    "--api-key",
+    envvar="OPENAI_API_KEY",
+    hidden=True,
+    callback=_require_api_key,
+    help="OpenAI API key (defaults to $OPENAI_API_KEY)"
+)
 @click.option(
     "--prompt", "-p",
     required=True,
-    help="Text description of the image to generate"
+    multiple=True,
+    help="Text description of the image to generate (repeat to generate several prompts concurrently)"
 )
 @click.option(
     "--style", "-s",
@@ -125,9 +573,26 @@ def generate_image(prompt: str, style: str, theme: str, output: str):
     default="./generated_image.png",
     type=click.Path(),
     show_default=True,
-    help="Output file path"
+    help="Output file path (numbered as name_1.png, name_2.png, ... for multiple images)"
+)
+@click.option(
+    "--count", "-n",
+    default=1,
+    type=click.IntRange(1, 10),
+    show_default=True,
+    help="Number of images to generate per prompt in a single request"
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Always call the API instead of reusing previously generated images"
+)
+@click.option(
+    "--fast",
+    is_flag=True,
+    help="Call the images API over raw HTTP, skipping the OpenAI SDK's response parsing"
 )
-def main(prompt, style, theme, output):
+def main(api_key, prompt, style, theme, output, count, no_cache, fast):
     """
     Generate AI images using OpenAI's gpt-image-1 model.
 
@@ -136,12 +601,15 @@ def main(prompt, style, theme, output):
       python main.py -p "a cat sitting on a tree"
       python main.py -p "a sunset over mountains" -s horizontal -t oil-paint
       python main.py -p "a robot in a city" -s vertical -t futuristic -o robot.png
+      python main.py -p "a friendly dragon" -t pixar -n 4 -o dragon.png
+      python main.py -p "a red fox" -p "a snowy owl" -t ghibli -o animals.png
 
     \b
     Available styles: vertical, horizontal, square
     Available themes: ghibli, futuristic, pixar, oil-paint, chinese-paint
     """
-    generate_image(prompt=prompt, style=style, theme=theme, output=output)
+    generate_image(prompt=prompt, style=style, theme=theme, output=output, count=count,
+                   use_cache=not no_cache, fast=fast, api_key=api_key)
 
 
 if __name__ == "__main__":
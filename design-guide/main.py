@@ -5,105 +5,663 @@ Extract comprehensive design language including colors, typography, animations,
 interactions, shadows, and UI/UX patterns from websites.
 """
 
-import os
 import sys
-import json
 import re
+import asyncio
+import base64
+import io
+from contextlib import AsyncExitStack, asynccontextmanager
+from itertools import islice
+from os.path import basename
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from urllib.parse import urlparse
+from typing import Dict, List, Any, Callable, Optional, Sequence, TextIO
 import click
-from playwright.sync_api import sync_playwright, Page
-from bs4 import BeautifulSoup
-import cssutils
-import logging
+import orjson
+from PIL import Image
+from playwright.async_api import async_playwright, Browser, CDPSession, Page, Response, Route, Error as PlaywrightError
+import tinycss2
+
+# CSS functions that denote a color inside a computed shadow value
+COLOR_FUNCTIONS = {'rgb', 'rgba', 'hsl', 'hsla', 'hwb', 'lab', 'lch', 'oklab', 'oklch', 'color'}
+
+# Viewports of the responsive captures, by breakpoint name
+BREAKPOINTS = {
+    'mobile': {'width': 375, 'height': 812},
+    'tablet': {'width': 768, 'height': 1024},
+    'desktop': {'width': 1920, 'height': 1080}
+}
+
+# Video and audio URLs, by extension, that pages are not allowed to download
+MEDIA_URL_PATTERNS = [
+    pattern
+    for extension in ('mp4', 'm4v', 'webm', 'ogv', 'ogg', 'mov', 'mkv', 'mp3', 'm4a', 'aac', 'wav', 'flac', 'm3u8', 'mpd')
+    for pattern in (f"*.{extension}", f"*.{extension}?*")
+]
+
+# Seconds a breakpoint screenshot may take before it is retried clipped
+SCREENSHOT_TIMEOUT = 10.0
+
+# Resource types the first load keeps for the breakpoint pages to replay:
+# what makes up the page's markup, styles and text metrics. Images and other
+# large bodies are left to the network instead of being held in memory
+REPLAYED_RESOURCE_TYPES = {'document', 'stylesheet', 'script', 'font'}
+
+# Response headers that no longer hold once a cached body is replayed
+REPLAY_DROPPED_HEADERS = {
+    'content-encoding', 'content-length', 'transfer-encoding',
+    'content-security-policy', 'content-security-policy-report-only'
+}
+
+# Stops animations, transitions and the text caret on pages that are only
+# captured, so their screenshots are identical from run to run
+FREEZE_ANIMATIONS_CSS = """
+*, *::before, *::after {
+    animation: none !important;
+    transition: none !important;
+    caret-color: transparent !important;
+}
+"""
+
+# Page-side helpers, installed once per document with add_init_script so each
+# step is a short function call instead of a script shipped and compiled per
+# evaluate.
+EXTRACTOR_SCRIPT = """
+window.__designGuide = {
+    // Element references from extractPageData, for captureHoverStates
+    interactive: [],
+
+    waitForSettled: () => Promise.race([
+        document.fonts.ready.then(() => new Promise(resolve => requestIdleCallback(resolve, { timeout: 1500 }))),
+        new Promise(resolve => setTimeout(resolve, 2000))
+    ]),
+
+    extractCss: async () => {
+        const inline = Array.from(document.querySelectorAll('style'), style => style.textContent);
+        const hrefs = [...new Set(Array.from(
+            document.querySelectorAll('link[rel="stylesheet"]'), link => link.href
+        ))].filter(Boolean);
+        // The page just loaded these sheets, so take them from the HTTP cache
+        // without revalidating
+        const texts = await Promise.all(hrefs.map(href =>
+            fetch(href, { cache: 'force-cache' })
+                .then(response => response.ok ? response.text() : null)
+                .catch(() => false)
+        ));
+        return { inline, links: hrefs.map((href, i) => ({ href, text: texts[i] })) };
+    },
+
+    extractPageData: (maxElements) => {
+        const INTERACTIVE = 'a, button, input, select, textarea, [onclick], [tabindex]';
+        const TEXT = 'h1, h2, h3, h4, h5, h6, p, a, span, button, li, label';
+        const BUTTON = 'button, [role="button"], a.btn, a.button, input[type="button"], input[type="submit"]';
+        const CARD = '[class*="card"], .article, article, [class*="post"]';
+        const NAV = 'nav, [role="navigation"], header nav';
+        const FORM = 'form, input, select, textarea';
+        const COMPONENT = [BUTTON, CARD, NAV, FORM].join(', ');
+        const HEADINGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6'];
+        // Elements that are never rendered, and SVG internals, are pruned with their subtrees
+        const SKIP_TAGS = new Set(['head', 'script', 'style', 'link', 'meta', 'noscript', 'template']);
+        const SVG_NS = 'http://www.w3.org/2000/svg';
+        const byNumber = (a, b) => parseFloat(a) - parseFloat(b);
+
+        // Style values repeat heavily across elements, so each element's record
+        // is a run of indices into a string pool, stored back to back in one
+        // flat array; labels[i] names the element whose record starts at
+        // i * STYLE_PROPS.length
+        const STYLE_PROPS = [
+            'fontFamily', 'fontSize', 'fontWeight', 'lineHeight', 'letterSpacing', 'textAlign', 'textTransform',
+            'color', 'backgroundColor',
+            'margin', 'padding', 'border', 'borderRadius',
+            'display', 'position', 'width', 'height', 'maxWidth', 'minWidth',
+            'flexDirection', 'justifyContent', 'alignItems', 'gap', 'gridTemplateColumns',
+            'boxShadow', 'textShadow', 'opacity', 'filter', 'transform',
+            'transition', 'animation',
+            'cursor', 'overflow', 'zIndex'
+        ];
+        const pool = [];
+        const poolIndex = new Map();
+        const intern = value => {
+            let index = poolIndex.get(value);
+            if (index === undefined) {
+                index = pool.length;
+                pool.push(value);
+                poolIndex.set(value, index);
+            }
+            return index;
+        };
+        const records = [];
+        const labels = [];
+        // Distinct values of one property across all records, in first-seen
+        // order, minus the ones that mean "unset"
+        const valuesOf = (prop, ...unset) => {
+            const seenValues = new Set();
+            for (let i = STYLE_PROPS.indexOf(prop); i < records.length; i += STYLE_PROPS.length) {
+                seenValues.add(records[i]);
+            }
+            return Array.from(seenValues, i => pool[i]).filter(value => value && !unset.includes(value));
+        };
+        const interactive = [];
+        const interactiveElements = [];
+        let interactiveCount = 0;
+
+        const colors = {
+            border: new Set(),
+            gradients: new Set()
+        };
+        const typography = {
+            fonts: new Set(),
+            sizes: new Set(),
+            weights: new Set(),
+            lineHeights: new Set(),
+            letterSpacings: new Set(),
+            textTransforms: new Set(),
+            headings: {},
+            body: null
+        };
+        let bodyText = {};
+        const layout = {
+            margins: new Set(),
+            paddings: new Set(),
+            containers: []
+        };
+        const animatedElements = [];
+        const components = {
+            buttons: [],
+            cards: [],
+            navbars: [],
+            forms: [],
+            modals: [],
+            badges: [],
+            alerts: []
+        };
+        const seen = { buttons: 0, cards: 0, navbars: 0, forms: 0 };
+        const stickyElements = [];
+
+        const textStyle = (computed) => ({
+            fontSize: computed.fontSize,
+            fontWeight: computed.fontWeight,
+            lineHeight: computed.lineHeight,
+            letterSpacing: computed.letterSpacing,
+            color: computed.color
+        });
+
+        const walker = document.createTreeWalker(document.documentElement, NodeFilter.SHOW_ELEMENT, {
+            acceptNode: node => {
+                if (SKIP_TAGS.has(node.localName) || (node.namespaceURI === SVG_NS && node.localName !== 'svg')) {
+                    return NodeFilter.FILTER_REJECT;
+                }
+                // Hidden elements are skipped before any style is read. Their
+                // children are still visited: display: contents and
+                // visibility: hidden parents can have visible children.
+                const visible = node.checkVisibility
+                    ? node.checkVisibility({ checkOpacity: false, checkVisibilityCSS: true })
+                    : node.getClientRects().length > 0;
+                return visible ? NodeFilter.FILTER_ACCEPT : NodeFilter.FILTER_SKIP;
+            }
+        });
+
+        for (let el = walker.currentNode; el; el = walker.nextNode()) {
+            const computed = window.getComputedStyle(el);
+            // Read each property once; every CSSStyleDeclaration getter serializes a value
+            const {
+                fontFamily, fontSize, fontWeight, lineHeight, letterSpacing, textAlign, textTransform,
+                color, backgroundColor, backgroundImage, borderColor,
+                margin, marginTop, marginRight, marginBottom, marginLeft,
+                padding, paddingTop, paddingRight, paddingBottom, paddingLeft,
+                border, borderRadius, display, position, top, width, height, maxWidth, minWidth,
+                flexDirection, justifyContent, alignItems, gap, gridTemplateColumns,
+                boxShadow, textShadow, opacity, filter, transform,
+                transition, animation, cursor, overflow, zIndex
+            } = computed;
+            const tagName = el.tagName.toLowerCase();
+            let rect = null;
+            const getRect = () => rect || (rect = el.getBoundingClientRect());
+
+            // Computed styles
+            const id = el.id ? '#' + el.id : '';
+            labels.push(tagName + id + (el.classList.length ? '.' + el.classList[0] : ''));
+            // Same order as STYLE_PROPS
+            [
+                // Typography
+                fontFamily, fontSize, fontWeight, lineHeight, letterSpacing, textAlign, textTransform,
+                // Colors
+                color, backgroundColor,
+                // Box Model
+                margin, padding, border, borderRadius,
+                // Layout
+                display, position, width, height, maxWidth, minWidth,
+                // Flexbox/Grid
+                flexDirection, justifyContent, alignItems, gap, gridTemplateColumns,
+                // Visual Effects
+                boxShadow, textShadow, opacity, filter, transform,
+                // Transitions & Animations
+                transition, animation,
+                // Other
+                cursor, overflow, zIndex
+            ].forEach(value => records.push(intern(value)));
+
+            // Interactive elements
+            if (el.matches(INTERACTIVE)) {
+                const box = getRect();
+                if (box.width > 0 && box.height > 0) {
+                    interactiveElements.push(el);
+                    interactive.push({
+                        selector: tagName + id +
+                                  (el.className ? '.' + Array.from(el.classList).slice(0, 3).join('.') : ''),
+                        index: interactiveCount,
+                        position: { top: box.top, left: box.left, width: box.width, height: box.height },
+                        default: {
+                            backgroundColor,
+                            color,
+                            borderColor,
+                            boxShadow,
+                            transform,
+                            opacity,
+                            cursor,
+                            transition
+                        }
+                    });
+                }
+                interactiveCount++;
+            }
+
+            // Colors; text and background colors, like every other value set of a
+            // pooled property, are read from the records after the walk
+            if (backgroundImage && backgroundImage.includes('gradient')) {
+                colors.gradients.add(backgroundImage);
+            }
+            if (borderColor && borderColor !== 'rgba(0, 0, 0, 0)') {
+                colors.border.add(borderColor);
+            }
+
+            // Typography
+            if (el.matches(TEXT)) {
+                typography.fonts.add(fontFamily);
+                typography.sizes.add(fontSize);
+                typography.weights.add(fontWeight);
+                typography.lineHeights.add(lineHeight);
+                typography.letterSpacings.add(letterSpacing);
+                if (textTransform !== 'none') {
+                    typography.textTransforms.add(textTransform);
+                }
+            }
+            if (HEADINGS.includes(tagName) && !typography.headings[tagName]) {
+                typography.headings[tagName] = {
+                    fontSize,
+                    fontWeight,
+                    lineHeight,
+                    letterSpacing,
+                    marginTop,
+                    marginBottom,
+                    color
+                };
+            }
+            if (tagName === 'p' && !typography.body) {
+                typography.body = textStyle(computed);
+            } else if (el === document.body) {
+                bodyText = textStyle(computed);
+            }
+
+            // Layout and spacing
+            [marginTop, marginRight, marginBottom, marginLeft].forEach(value => {
+                if (value !== '0px') layout.margins.add(value);
+            });
+            [paddingTop, paddingRight, paddingBottom, paddingLeft].forEach(value => {
+                if (value !== '0px') layout.paddings.add(value);
+            });
+            if (maxWidth !== 'none' && marginLeft === 'auto' && marginRight === 'auto') {
+                if (getRect().width > 500) {
+                    layout.containers.push({
+                        maxWidth,
+                        padding,
+                        width: getRect().width + 'px'
+                    });
+                }
+            }
+
+            // Animated elements
+            if (animation !== 'none' && animatedElements.length < 10) {
+                if (getRect().width > 0 && getRect().height > 0) {
+                    animatedElements.push({
+                        selector: tagName + (el.className ? '.' + Array.from(el.classList).join('.') : ''),
+                        animation
+                    });
+                }
+            }
+
+            // Components: one combined match rules out most elements before the per-kind checks
+            if (el.matches(COMPONENT)) {
+                if (el.matches(BUTTON) && seen.buttons++ < 5) {
+                    components.buttons.push({
+                        text: el.textContent.trim().substring(0, 30),
+                        styles: {
+                            backgroundColor,
+                            color,
+                            padding,
+                            borderRadius,
+                            border,
+                            fontSize,
+                            fontWeight
+                        }
+                    });
+                }
+                if (el.matches(CARD) && seen.cards++ < 3) {
+                    if (getRect().width > 200 && getRect().height > 100) {
+                        components.cards.push({
+                            styles: {
+                                backgroundColor,
+                                borderRadius,
+                                boxShadow,
+                                padding,
+                                border
+                            }
+                        });
+                    }
+                }
+                if (el.matches(NAV) && seen.navbars++ < 2) {
+                    components.navbars.push({
+                        styles: {
+                            backgroundColor,
+                            height,
+                            position,
+                            boxShadow,
+                            padding
+                        }
+                    });
+                }
+                if (el.matches(FORM) && seen.forms++ < 5) {
+                    components.forms.push({
+                        type: tagName,
+                        styles: {
+                            backgroundColor,
+                            border,
+                            borderRadius,
+                            padding,
+                            fontSize
+                        }
+                    });
+                }
+            }
+
+            // UX patterns
+            if ((position === 'sticky' || position === 'fixed') && stickyElements.length < 5) {
+                stickyElements.push({
+                    tagName: tagName,
+                    position,
+                    top,
+                    zIndex
+                });
+            }
+        }
+
+        // Keep the element references so hover capture can read them directly
+        window.__designGuide.interactive = interactiveElements;
+
+        // Every record fed the value sets above, but past maxElements only
+        // every step-th one is sent back, so giant pages don't ship (and
+        // write out) tens of thousands of style records
+        const step = Math.ceil(labels.length / maxElements);
+        let sampledRecords = records;
+        let sampledLabels = labels;
+        if (step > 1) {
+            sampledRecords = [];
+            sampledLabels = [];
+            for (let i = 0; i < labels.length; i += step) {
+                sampledLabels.push(labels[i]);
+                const start = i * STYLE_PROPS.length;
+                for (let j = start; j < start + STYLE_PROPS.length; j++) sampledRecords.push(records[j]);
+            }
+        }
+
+        return {
+            // A typed array crosses the protocol as packed binary, not a JSON list
+            computed_styles: { properties: STYLE_PROPS, pool: pool, records: Uint32Array.from(sampledRecords), labels: sampledLabels },
+            interactive: interactive,
+            colors: {
+                textColors: valuesOf('color', 'rgba(0, 0, 0, 0)'),
+                backgroundColors: valuesOf('backgroundColor', 'rgba(0, 0, 0, 0)'),
+                borderColors: Array.from(colors.border),
+                gradients: Array.from(colors.gradients)
+            },
+            typography: {
+                fonts: Array.from(typography.fonts),
+                sizes: Array.from(typography.sizes).sort(byNumber),
+                weights: Array.from(typography.weights).sort(),
+                lineHeights: Array.from(typography.lineHeights).sort(),
+                letterSpacings: Array.from(typography.letterSpacings),
+                textTransforms: Array.from(typography.textTransforms),
+                // First occurrence of each level, listed h1 to h6 whatever the document order
+                headings: Object.fromEntries(
+                    HEADINGS.filter(tag => typography.headings[tag]).map(tag => [tag, typography.headings[tag]])
+                ),
+                body: typography.body || bodyText
+            },
+            layout: {
+                margins: Array.from(layout.margins).sort(byNumber),
+                paddings: Array.from(layout.paddings).sort(byNumber),
+                gaps: valuesOf('gap', 'normal', '0px').sort(byNumber),
+                borderRadii: valuesOf('borderRadius', '0px').sort(byNumber),
+                maxWidths: valuesOf('maxWidth', 'none'),
+                containers: layout.containers.slice(0, 5)
+            },
+            animations: {
+                transitions: valuesOf('transition', 'all 0s ease 0s', 'none'),
+                animatedElements: animatedElements
+            },
+            effects: {
+                boxShadows: valuesOf('boxShadow', 'none'),
+                textShadows: valuesOf('textShadow', 'none'),
+                filters: valuesOf('filter', 'none'),
+                transforms: valuesOf('transform', 'none'),
+                opacities: valuesOf('opacity', '1').sort()
+            },
+            components: components,
+            ux_patterns: {
+                scrollBehavior: window.getComputedStyle(document.documentElement).scrollBehavior,
+                focusVisible: [],
+                cursorStyles: valuesOf('cursor', 'auto'),
+                // Counted over the whole document, hidden elements included
+                interactiveElements: document.querySelectorAll(INTERACTIVE).length,
+                accessibilityFeatures: {
+                    ariaLabels: document.querySelectorAll('[aria-label]').length,
+                    ariaDescriptions: document.querySelectorAll('[aria-describedby]').length,
+                    roles: document.querySelectorAll('[role]').length,
+                    alts: document.querySelectorAll('img[alt]').length
+                },
+                stickyElements: stickyElements
+            }
+        };
+    },
+
+    captureHoverStates: () => {
+        const PROBE = 'data-hover-probe';
+        const probeRules = [];
+        const collect = (rules, wrap) => {
+            for (const rule of rules) {
+                if (rule instanceof CSSStyleRule) {
+                    if (rule.selectorText.includes(':hover')) {
+                        const selector = rule.selectorText.replace(/:hover\\b/g, `[${PROBE}]`);
+                        probeRules.push(wrap(`${selector} { ${rule.style.cssText} }`));
+                    }
+                } else if (rule instanceof CSSMediaRule) {
+                    collect(rule.cssRules, text => wrap(`@media ${rule.conditionText} { ${text} }`));
+                } else if (rule instanceof CSSSupportsRule) {
+                    collect(rule.cssRules, text => wrap(`@supports ${rule.conditionText} { ${text} }`));
+                }
+            }
+        };
+        for (const sheet of document.styleSheets) {
+            try {
+                collect(sheet.cssRules, text => text);
+            } catch (e) {
+                // CORS restrictions
+            }
+        }
 
-# Suppress cssutils warnings
-cssutils.log.setLevel(logging.CRITICAL)
+        const probeSheet = new CSSStyleSheet();
+        probeRules.forEach(text => {
+            try {
+                probeSheet.insertRule(text, probeSheet.cssRules.length);
+            } catch (e) {
+                // Selector the engine cannot parse outside its original sheet
+            }
+        });
+        document.adoptedStyleSheets = [...document.adoptedStyleSheets, probeSheet];
+
+        const states = window.__designGuide.interactive.slice(0, 10).map(el => {
+            const chain = [];
+            for (let node = el; node; node = node.parentElement) chain.push(node);
+            const inlineStyle = el.getAttribute('style');
+            try {
+                el.style.setProperty('transition', 'none', 'important');
+                chain.forEach(node => node.setAttribute(PROBE, ''));
+                el.dispatchEvent(new MouseEvent('mouseover', { bubbles: true }));
+                el.dispatchEvent(new MouseEvent('mouseenter'));
+
+                const computed = window.getComputedStyle(el);
+                return {
+                    backgroundColor: computed.backgroundColor,
+                    color: computed.color,
+                    borderColor: computed.borderColor,
+                    boxShadow: computed.boxShadow,
+                    transform: computed.transform,
+                    opacity: computed.opacity
+                };
+            } catch (e) {
+                return null;
+            } finally {
+                el.dispatchEvent(new MouseEvent('mouseleave'));
+                el.dispatchEvent(new MouseEvent('mouseout', { bubbles: true }));
+                chain.forEach(node => node.removeAttribute(PROBE));
+                if (inlineStyle === null) {
+                    el.removeAttribute('style');
+                } else {
+                    el.setAttribute('style', inlineStyle);
+                }
+            }
+        });
+
+        document.adoptedStyleSheets = document.adoptedStyleSheets.filter(sheet => sheet !== probeSheet);
+        return states;
+    },
+
+    // Read in the next animation frame, where the layout the frame needs
+    // anyway answers all reads at once, rather than forcing one right after
+    // a style change
+    measureLayout: () => new Promise(resolve => requestAnimationFrame(() => {
+        const body = document.body;
+        const html = document.documentElement;
+        resolve({
+            viewportWidth: window.innerWidth,
+            viewportHeight: window.innerHeight,
+            scrollHeight: Math.max(body.scrollHeight, html.scrollHeight),
+            bodyWidth: body.getBoundingClientRect().width
+        });
+    }))
+};
+"""
+
+
+@asynccontextmanager
+async def launch_browser():
+    """Launch one Chromium process to be shared by several extractions."""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        try:
+            yield browser
+        finally:
+            await browser.close()
+
+
+async def _send_within(cdp: CDPSession, method: str, params: Dict[str, Any], timeout: float) -> Optional[Dict[str, Any]]:
+    """Send a CDP command and return its result, or None if it takes longer than timeout.
+
+    The command itself can't be called off, so it is left to finish or fail
+    with its session, and whatever it ends with is discarded.
+    """
+    send = asyncio.ensure_future(cdp.send(method, params))
+    try:
+        return await asyncio.wait_for(asyncio.shield(send), timeout)
+    except asyncio.TimeoutError:
+        send.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return None
 
 
 class DesignExtractor:
     """Extract comprehensive design language from a website."""
 
-    def __init__(self, url: str, viewport_width: int = 1600, viewport_height: int = 1200):
+    def __init__(self, url: str, viewport_width: int = 1600, viewport_height: int = 1200,
+                 browser: Optional[Browser] = None, max_elements: int = 3000,
+                 breakpoints: Sequence[str] = tuple(BREAKPOINTS)):
         self.url = url
         self.viewport_width = viewport_width
         self.viewport_height = viewport_height
+        self.max_elements = max_elements
+        self.breakpoints = breakpoints
+        self.document_url = None
+        self.cached_responses = {}
+        self.cache_writes = []
+        self.browser = browser
         self.html_content = ""
         self.css_content = ""
         self.computed_styles = {}
 
-    def extract_all(self, output_dir: Path) -> Dict[str, Any]:
-        """Extract all design information from the URL."""
+    async def extract_all(self, output_dir: Path) -> Dict[str, Any]:
+        """Extract all design information from the URL.
+
+        Runs in a fresh context of the shared browser when one was given, so
+        pages stay isolated without paying for a browser launch each time;
+        otherwise a browser is launched for this extraction alone.
+        """
         click.echo(click.style(f"🎨 Extracting comprehensive design from: {self.url}", fg="cyan", bold=True))
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            context = browser.new_context(
-                viewport={'width': self.viewport_width, 'height': self.viewport_height}
-            )
-            page = context.new_page()
+        async with AsyncExitStack() as stack:
+            browser = self.browser or await stack.enter_async_context(launch_browser())
 
             # Navigate to URL
             click.echo("📄 Loading page...")
-            page.goto(self.url, wait_until="networkidle")
-            page.wait_for_timeout(2000)  # Extra time for animations
+            page = await self._open_page(stack, browser, self.viewport_width, self.viewport_height)
 
-            # Take base screenshots
+            # Screenshots, HTML, CSS and the style pass don't depend on each
+            # other, so their round-trips overlap instead of running in turn
             click.echo("📸 Taking screenshots...")
-            viewport_screenshot = output_dir / "viewport_screenshot.png"
-            fullpage_screenshot = output_dir / "fullpage_screenshot.png"
-            page.screenshot(path=str(viewport_screenshot))
-            page.screenshot(path=str(fullpage_screenshot), full_page=True)
-
-            # Extract HTML
             click.echo("🔍 Extracting HTML structure...")
-            self.html_content = page.content()
-
-            # Extract all CSS
             click.echo("💅 Extracting CSS styles...")
-            self.css_content = self._extract_css(page)
-
-            # Extract computed styles
-            click.echo("🎯 Computing element styles...")
-            self.computed_styles = self._extract_computed_styles(page)
+            click.echo("🎯 Analyzing element styles (colors, typography, layout, effects, components)...")
+            viewport_screenshot = output_dir / "viewport_screenshot.png"
+            fullpage_screenshot = output_dir / "fullpage_screenshot.png"
+            fullpage_png, self.html_content, self.css_content, page_data = await asyncio.gather(
+                page.screenshot(full_page=True),
+                page.content(),
+                self._extract_css(page),
+                self._extract_page_data(page),
+            )
+            # The viewport shot is the top of the full-page one, so crop it
+            # instead of asking Chromium to render the page a second time
+            await asyncio.to_thread(self._save_screenshots, fullpage_png, viewport_screenshot, fullpage_screenshot)
+            self.computed_styles = self._expand_computed_styles(page_data['computed_styles'])
+            colors = page_data['colors']
+            typography = page_data['typography']
+            layout = page_data['layout']
+            animations = page_data['animations']
+            animations['keyframes'] = self._extract_keyframes(self.css_content)
+            effects = page_data['effects']
+            colors['shadowColors'] = self._extract_shadow_colors(effects['boxShadows'])
+            components = page_data['components']
+            ux_patterns = page_data['ux_patterns']
 
             # Extract interactive states
             click.echo("⚡ Capturing interactive states...")
-            interactive_states = self._capture_interactive_states(page, output_dir)
-
-            # Extract color palette
-            click.echo("🎨 Analyzing color palette...")
-            colors = self._extract_colors(page)
-
-            # Extract typography
-            click.echo("📝 Analyzing typography...")
-            typography = self._extract_typography(page)
-
-            # Extract spacing and layout
-            click.echo("📐 Analyzing layout and spacing...")
-            layout = self._extract_layout(page)
-
-            # Extract animations and transitions
-            click.echo("✨ Detecting animations and transitions...")
-            animations = self._extract_animations(page)
-
-            # Extract shadows and effects
-            click.echo("🌟 Extracting shadows and visual effects...")
-            effects = self._extract_effects(page)
-
-            # Extract component patterns
-            click.echo("🧩 Identifying component patterns...")
-            components = self._identify_components(page)
-
-            # Extract UX patterns
-            click.echo("🎭 Analyzing UX patterns...")
-            ux_patterns = self._analyze_ux_patterns(page)
+            interactive_states = await self._capture_interactive_states(page, page_data['interactive'], output_dir)
 
             # Extract responsive breakpoints
-            click.echo("📱 Testing responsive behavior...")
-            responsive = self._test_responsive(page, output_dir)
-
-            browser.close()
+            responsive = {}
+            if self.breakpoints:
+                click.echo("📱 Testing responsive behavior...")
+                # Responses still being read would miss the replay cache
+                await asyncio.gather(*self.cache_writes)
+                responsive = await self._test_responsive(browser, output_dir)
 
         # Compile all data
         data = {
@@ -124,992 +682,764 @@ class DesignExtractor:
             }
         }
 
-        # Save all extracted data
+        # Save all extracted data, encoding and writing on worker threads
         click.echo("💾 Saving extracted data...")
-        (output_dir / "extracted.html").write_text(self.html_content, encoding='utf-8')
-        (output_dir / "extracted.css").write_text(self.css_content, encoding='utf-8')
-        (output_dir / "computed_styles.json").write_text(
-            json.dumps(self.computed_styles, indent=2),
-            encoding='utf-8'
-        )
-        (output_dir / "design_data.json").write_text(
-            json.dumps(data, indent=2),
-            encoding='utf-8'
+        await asyncio.gather(
+            asyncio.to_thread((output_dir / "extracted.html").write_text, self.html_content, encoding='utf-8'),
+            asyncio.to_thread((output_dir / "extracted.css").write_text, self.css_content, encoding='utf-8'),
+            asyncio.to_thread(self._write_json, output_dir / "computed_styles.json", self.computed_styles),
+            asyncio.to_thread(self._write_json, output_dir / "design_data.json", data),
         )
 
         return data
 
-    def _extract_css(self, page: Page) -> str:
+    async def _open_page(self, stack: AsyncExitStack, browser: Browser, width: int, height: int,
+                         is_mobile: bool = False) -> Page:
+        """Load the URL in a fresh context with the given viewport and wait for it to settle.
+
+        The viewport, and for phones mobile and touch emulation, are device
+        metrics the context starts with, so no resize happens after load. The
+        first load keeps its document, style, script and font responses; later
+        loads go straight to the final document URL and are served those
+        copies instead of fetching (and redirecting) again. The context is
+        closed when the stack unwinds.
+        """
+        context = await browser.new_context(
+            viewport={'width': width, 'height': height},
+            is_mobile=is_mobile,
+            has_touch=is_mobile
+        )
+        stack.push_async_callback(context.close)
+        await context.add_init_script(EXTRACTOR_SCRIPT)
+        page = await context.new_page()
+        await self._block_media(page)
+        replay = self.document_url is not None
+        if replay:
+            await page.route(lambda url: url in self.cached_responses, self._serve_cached_response)
+        elif self.breakpoints:
+            # Only the breakpoint pages replay the cache, so skip it without them
+            page.on("response", self._on_response)
+        response = await page.goto(self.document_url or self.url, wait_until="networkidle")
+        if not replay and response is not None and response.ok:
+            self.document_url = response.url
+        # Wait for web fonts and for the main thread to go idle (capped)
+        # instead of a flat delay
+        await page.evaluate("() => window.__designGuide.waitForSettled()")
+        return page
+
+    def _on_response(self, response: Response) -> None:
+        """Start caching a response of the first load, keeping the task so it can be awaited."""
+        self.cache_writes.append(asyncio.ensure_future(self._cache_response(response)))
+
+    async def _cache_response(self, response: Response) -> None:
+        """Keep a GET response from the first load for later loads to replay.
+
+        Only REPLAYED_RESOURCE_TYPES are kept. Redirects are left out: later
+        loads start at the final URL, and a redirect has no body to replay.
+        """
+        if (response.request.method != "GET" or 300 <= response.status < 400
+                or response.request.resource_type not in REPLAYED_RESOURCE_TYPES):
+            return
+        try:
+            body = await response.body()
+        except PlaywrightError:
+            # Evicted, or the page went away before the body was read
+            return
+        # The body comes back decoded, and the replayed page only gets captured
+        # (with an injected stylesheet), so encoding, length and CSP headers go
+        headers = {name: value for name, value in response.headers.items() if name not in REPLAY_DROPPED_HEADERS}
+        self.cached_responses.setdefault(response.url, (response.status, headers, body))
+
+    async def _serve_cached_response(self, route: Route) -> None:
+        """Answer a request with the response the first load got for the same URL."""
+        status, headers, body = self.cached_responses[route.request.url]
+        await route.fulfill(status=status, headers=headers, body=body)
+
+    async def _block_media(self, page: Page) -> None:
+        """Block video and audio downloads, which often keep the network from going idle.
+
+        The block list lives in Chromium's network stack rather than in a
+        Playwright route: any route turns on request interception, which
+        disables the HTTP cache and sends every request through Python.
+        Images and fonts still load: they show up in the screenshots and
+        affect text metrics.
+        """
+        cdp = await page.context.new_cdp_session(page)
+        await cdp.send("Network.enable")
+        await cdp.send("Network.setBlockedURLs", {"urls": MEDIA_URL_PATTERNS})
+
+    def _save_screenshots(self, fullpage_png: bytes, viewport_path: Path, fullpage_path: Path) -> None:
+        """Write the full-page screenshot and the viewport-sized crop of its top."""
+        fullpage_path.write_bytes(fullpage_png)
+        with Image.open(io.BytesIO(fullpage_png)) as image:
+            image.crop((0, 0, min(self.viewport_width, image.width),
+                        min(self.viewport_height, image.height))).save(viewport_path)
+
+    def _write_json(self, path: Path, value: Any) -> None:
+        """Write a value as indented JSON, encoded straight to UTF-8 bytes by orjson."""
+        path.write_bytes(orjson.dumps(value, option=orjson.OPT_INDENT_2))
+
+    async def _extract_css(self, page: Page) -> str:
         """Extract all CSS from the page."""
-        css_links = page.query_selector_all('link[rel="stylesheet"]')
-        inline_styles = page.query_selector_all('style')
+        # Read inline styles and fetch every linked stylesheet in one call; the
+        # browser issues the fetches concurrently and mostly serves them from cache
+        sources = await page.evaluate("() => window.__designGuide.extractCss()")
 
         css_content = []
 
         # Extract inline styles
-        for style in inline_styles:
-            content = page.evaluate('(element) => element.textContent', style)
+        for content in sources['inline']:
             if content:
                 css_content.append(f"/* Inline Style */\n{content}")
 
         # Extract linked stylesheets
-        for link in css_links:
-            href = page.evaluate('(element) => element.href', link)
-            try:
-                response = page.request.get(href)
-                if response.ok:
-                    css_content.append(f"/* From: {href} */\n{response.text()}")
-            except Exception as e:
-                click.echo(f"⚠️  Could not fetch {href}: {e}", err=True)
+        for link in sources['links']:
+            href, text = link['href'], link['text']
+            if text is False:
+                # The in-page fetch was blocked (usually CORS); fetch outside the page
+                try:
+                    response = await page.request.get(href)
+                    text = await response.text() if response.ok else None
+                except Exception as e:
+                    click.echo(f"⚠️  Could not fetch {href}: {e}", err=True)
+                    continue
+            if text is not None:
+                css_content.append(f"/* From: {href} */\n{text}")
 
         return '\n\n'.join(css_content)
 
-    def _extract_computed_styles(self, page: Page) -> Dict[str, Any]:
-        """Extract computed styles for key elements."""
-        script = """
-        () => {
-            const elements = document.querySelectorAll('*');
-            const styles = {};
-            const seenSelectors = new Set();
-
-            elements.forEach((el, idx) => {
-                const computed = window.getComputedStyle(el);
-                const tagName = el.tagName.toLowerCase();
-                const id = el.id ? '#' + el.id : '';
-                const classes = el.className ? '.' + Array.from(el.classList).join('.') : '';
-
-                let selector = tagName + id + classes;
-                if (seenSelectors.has(selector)) {
-                    selector += '_' + idx;
-                }
-                seenSelectors.add(selector);
-
-                styles[selector] = {
-                    // Typography
-                    fontFamily: computed.fontFamily,
-                    fontSize: computed.fontSize,
-                    fontWeight: computed.fontWeight,
-                    lineHeight: computed.lineHeight,
-                    letterSpacing: computed.letterSpacing,
-                    textAlign: computed.textAlign,
-                    textTransform: computed.textTransform,
-
-                    // Colors
-                    color: computed.color,
-                    backgroundColor: computed.backgroundColor,
+    def _expand_computed_styles(self, compact: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+        """Rebuild per-element style dicts from the flat string-pooled form returned by the page.
 
-                    // Box Model
-                    margin: computed.margin,
-                    padding: computed.padding,
-                    border: computed.border,
-                    borderRadius: computed.borderRadius,
-
-                    // Layout
-                    display: computed.display,
-                    position: computed.position,
-                    width: computed.width,
-                    height: computed.height,
-                    maxWidth: computed.maxWidth,
-                    minWidth: computed.minWidth,
-
-                    // Flexbox/Grid
-                    flexDirection: computed.flexDirection,
-                    justifyContent: computed.justifyContent,
-                    alignItems: computed.alignItems,
-                    gap: computed.gap,
-                    gridTemplateColumns: computed.gridTemplateColumns,
-
-                    // Visual Effects
-                    boxShadow: computed.boxShadow,
-                    textShadow: computed.textShadow,
-                    opacity: computed.opacity,
-                    filter: computed.filter,
-                    transform: computed.transform,
-
-                    // Transitions & Animations
-                    transition: computed.transition,
-                    animation: computed.animation,
-
-                    // Other
-                    cursor: computed.cursor,
-                    overflow: computed.overflow,
-                    zIndex: computed.zIndex
-                };
-            });
-
-            return styles;
-        }
+        Elements are keyed by their label, suffixed with the element index when
+        an earlier element already used it. Elements with identical records
+        (list items, table cells, repeated cards) share one dict, so each
+        distinct style is decoded once.
         """
-        return page.evaluate(script)
-
-    def _capture_interactive_states(self, page: Page, output_dir: Path) -> Dict[str, Any]:
-        """Capture hover, focus, and active states of interactive elements."""
-        script = """
-        () => {
-            const interactive = document.querySelectorAll('a, button, input, select, textarea, [onclick], [tabindex]');
-            const states = [];
-
-            interactive.forEach((el, idx) => {
-                const computed = window.getComputedStyle(el);
-                const rect = el.getBoundingClientRect();
-
-                if (rect.width > 0 && rect.height > 0) {
-                    const selector = el.tagName.toLowerCase() +
-                                   (el.id ? '#' + el.id : '') +
-                                   (el.className ? '.' + Array.from(el.classList).slice(0, 3).join('.') : '');
+        properties, pool, records = compact['properties'], compact['pool'], compact['records']
+        width = len(properties)
+        styles = {}
+        decoded = {}
+        for index, label in enumerate(compact['labels']):
+            key = label if label not in styles else f"{label}_{index}"
+            start = index * width
+            record = tuple(records[start:start + width])
+            style = decoded.get(record)
+            if style is None:
+                style = decoded[record] = dict(zip(properties, map(pool.__getitem__, record)))
+            styles[key] = style
+        return styles
+
+    async def _extract_page_data(self, page: Page) -> Dict[str, Any]:
+        """Extract computed styles and every style-derived category in one DOM pass.
+
+        Each element's computed style is resolved once and fanned out to all
+        categories, instead of one querySelectorAll('*') walk and one
+        getComputedStyle call per category. A TreeWalker prunes subtrees that
+        are never rendered (head, scripts, styles, SVG internals) and skips
+        hidden elements. Computed styles are sampled down to max_elements
+        elements; the other categories always cover the whole page.
+        """
+        return await page.evaluate("max => window.__designGuide.extractPageData(max)", self.max_elements)
 
-                    states.push({
-                        selector: selector,
-                        index: idx,
-                        position: { top: rect.top, left: rect.left, width: rect.width, height: rect.height },
-                        default: {
-                            backgroundColor: computed.backgroundColor,
-                            color: computed.color,
-                            borderColor: computed.borderColor,
-                            boxShadow: computed.boxShadow,
-                            transform: computed.transform,
-                            opacity: computed.opacity,
-                            cursor: computed.cursor,
-                            transition: computed.transition
-                        }
-                    });
-                }
-            });
+    def _extract_keyframes(self, css: str) -> List[Dict[str, Any]]:
+        """Extract @keyframes rules from the collected CSS text.
 
-            return states;
-        }
+        Parsing the text in Python also covers cross-origin stylesheets, whose
+        cssRules the page itself is not allowed to read.
         """
-
-        interactive_elements = page.evaluate(script)
-
-        # Capture hover states for first 10 visible interactive elements
-        hover_states = []
-        for i, elem in enumerate(interactive_elements[:10]):
-            try:
-                # Find element by position
-                x = elem['position']['left'] + elem['position']['width'] / 2
-                y = elem['position']['top'] + elem['position']['height'] / 2
-
-                # Hover over element
-                page.mouse.move(x, y)
-                page.wait_for_timeout(300)
-
-                # Capture hover state
-                hover_script = f"""
-                (x, y) => {{
-                    const el = document.elementFromPoint(x, y);
-                    if (el) {{
-                        const computed = window.getComputedStyle(el);
-                        return {{
-                            backgroundColor: computed.backgroundColor,
-                            color: computed.color,
-                            borderColor: computed.borderColor,
-                            boxShadow: computed.boxShadow,
-                            transform: computed.transform,
-                            opacity: computed.opacity
-                        }};
-                    }}
-                    return null;
-                }}
-                """
-                hover_state = page.evaluate(hover_script, x, y)
-
-                if hover_state:
-                    hover_states.append({
-                        'selector': elem['selector'],
-                        'hover': hover_state,
-                        'default': elem['default']
-                    })
-
-            except Exception as e:
+        keyframes = []
+        for rule in tinycss2.parse_stylesheet(css, skip_comments=True, skip_whitespace=True):
+            if rule.type != 'at-rule' or not rule.lower_at_keyword.endswith('keyframes') or rule.content is None:
                 continue
+            name = tinycss2.serialize(rule.prelude).strip().strip('"\'')
+            frames = []
+            for frame in tinycss2.parse_rule_list(rule.content, skip_comments=True, skip_whitespace=True):
+                if frame.type != 'qualified-rule':
+                    continue
+                declarations = [
+                    f"{decl.name}: {tinycss2.serialize(decl.value).strip()}{' !important' if decl.important else ''};"
+                    for decl in tinycss2.parse_declaration_list(frame.content, skip_comments=True, skip_whitespace=True)
+                    if decl.type == 'declaration'
+                ]
+                frames.append(f"{tinycss2.serialize(frame.prelude).strip()} {{ {' '.join(declarations)} }}")
+            keyframes.append({'name': name, 'rules': frames})
+        return keyframes
+
+    def _extract_shadow_colors(self, box_shadows: List[str]) -> List[str]:
+        """Collect the distinct colors used in a set of box-shadow values.
+
+        The page only reports each distinct box-shadow once, so this tokenizes
+        a short deduplicated list instead of running a regex per element, and
+        recognizes every color notation rather than just rgb()/rgba().
+        """
+        colors = {}
+        for shadow in box_shadows:
+            for token in tinycss2.parse_component_value_list(shadow):
+                if token.type == 'hash' or (token.type == 'function' and token.lower_name in COLOR_FUNCTIONS):
+                    colors[tinycss2.serialize([token])] = None
+        return list(colors)
+
+    async def _capture_interactive_states(self, page: Page, interactive_elements: List[Dict[str, Any]],
+                                          output_dir: Path) -> Dict[str, Any]:
+        """Capture hover states of the visible interactive elements."""
+        # Hover the first 10 visible interactive elements in a single call.
+        # Every :hover rule the page can read is mirrored onto a probe
+        # attribute, which is set on the element and its ancestors (as real
+        # hovering would) with transitions disabled, so the final hover style
+        # can be read at once. Mouse events are dispatched too, for hover
+        # effects driven by script.
+        hover_results = await page.evaluate("() => window.__designGuide.captureHoverStates()")
+
+        hover_states = [
+            {
+                'selector': elem['selector'],
+                'hover': hover_state,
+                'default': elem['default']
+            }
+            for elem, hover_state in zip(interactive_elements, hover_results)
+            if hover_state
+        ]
 
-        # Take screenshot with hover state
+        # Take screenshot with the last sampled element really hovered
         if hover_states:
-            page.screenshot(path=str(output_dir / "interactive_hover.png"))
+            last = interactive_elements[len(hover_results) - 1]['position']
+            await page.mouse.move(last['left'] + last['width'] / 2, last['top'] + last['height'] / 2)
+            await page.screenshot(path=str(output_dir / "interactive_hover.png"))
 
         return {
             'all_interactive': interactive_elements,
             'hover_samples': hover_states
         }
 
-    def _extract_colors(self, page: Page) -> Dict[str, List[str]]:
-        """Extract comprehensive color palette."""
-        script = """
-        () => {
-            const colors = {
-                text: new Set(),
-                background: new Set(),
-                border: new Set(),
-                shadow: new Set(),
-                gradients: []
-            };
-
-            document.querySelectorAll('*').forEach(el => {
-                const computed = window.getComputedStyle(el);
+    async def _capture_viewport(self, page: Page, cdp: CDPSession, bp: Dict[str, Any]) -> Optional[bytes]:
+        """Capture the breakpoint's viewport as JPEG bytes, giving up after SCREENSHOT_TIMEOUT.
 
-                // Text colors
-                if (computed.color && computed.color !== 'rgba(0, 0, 0, 0)') {
-                    colors.text.add(computed.color);
-                }
+        A capture that stalls (typically on a huge or malformed page) is
+        retried once clipped to the viewport rectangle, which Chromium can
+        always paint from the current surface. Timing out only stops waiting
+        on our side, so the retry goes through a fresh CDP session rather than
+        queueing behind the stalled capture. If that stalls too, a warning is
+        printed and None is returned instead of hanging or failing the run.
+        """
+        params = {"format": "jpeg", "quality": 80, "captureBeyondViewport": False}
+        shot = await _send_within(cdp, "Page.captureScreenshot", params, SCREENSHOT_TIMEOUT)
+        if shot is None:
+            click.echo(click.style(
+                f"⚠️  {bp['name']} screenshot timed out after {SCREENSHOT_TIMEOUT:g}s, retrying clipped to the viewport",
+                fg="yellow"
+            ))
+            retry = await page.context.new_cdp_session(page)
+            clip = {'x': 0, 'y': 0, 'width': bp['width'], 'height': bp['height'], 'scale': 1}
+            shot = await _send_within(retry, "Page.captureScreenshot", {**params, "clip": clip}, SCREENSHOT_TIMEOUT)
+        if shot is None:
+            click.echo(click.style(
+                f"⚠️  {bp['name']} screenshot did not finish within {SCREENSHOT_TIMEOUT:g}s, skipping that breakpoint",
+                fg="yellow"
+            ))
+            return None
+        return base64.b64decode(shot['data'])
+
+    async def _test_responsive(self, browser: Browser, output_dir: Path) -> Dict[str, Any]:
+        """Test responsive behavior at different breakpoints.
+
+        Each breakpoint loads the page in its own context of the shared
+        browser, sized from the start, so the breakpoints load, settle and
+        capture concurrently instead of resizing one page in turn. Each
+        context is closed as soon as its capture is done.
+        """
+        breakpoints = [
+            {'name': name, **size} for name, size in BREAKPOINTS.items() if name in self.breakpoints
+        ]
 
-                // Background colors and gradients
-                if (computed.backgroundColor && computed.backgroundColor !== 'rgba(0, 0, 0, 0)') {
-                    colors.background.add(computed.backgroundColor);
-                }
-                if (computed.backgroundImage && computed.backgroundImage !== 'none') {
-                    if (computed.backgroundImage.includes('gradient')) {
-                        colors.gradients.push(computed.backgroundImage);
-                    }
-                }
+        async def capture(bp: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            async with AsyncExitStack() as stack:
+                page = await self._open_page(stack, browser, bp['width'], bp['height'],
+                                             is_mobile=bp['name'] == 'mobile')
+                # Animations were already recorded from the main page; here they
+                # only make the captures differ from run to run
+                await page.add_style_tag(content=FREEZE_ANIMATIONS_CSS)
+
+                # Take screenshot straight through CDP, skipping Playwright's
+                # screenshot pre- and post-processing, and get layout info at this
+                # breakpoint on the same session; both only read the settled page,
+                # so the two commands are sent back to back. These are reference
+                # shots, so they are JPEG, which encodes far faster than PNG.
+                # measureLayout waits on a frame, so a stalled renderer would
+                # hang it just like the screenshot; it gets the same timeout.
+                cdp = await page.context.new_cdp_session(page)
+                shot, layout = await asyncio.gather(
+                    self._capture_viewport(page, cdp, bp),
+                    _send_within(cdp, "Runtime.evaluate", {
+                        "expression": "window.__designGuide.measureLayout()",
+                        "awaitPromise": True,
+                        "returnByValue": True
+                    }, SCREENSHOT_TIMEOUT)
+                )
+            if layout is None:
+                click.echo(click.style(
+                    f"⚠️  {bp['name']} layout did not finish within {SCREENSHOT_TIMEOUT:g}s, skipping that breakpoint",
+                    fg="yellow"
+                ))
+            if shot is None or layout is None:
+                return None
+
+            screenshot_path = output_dir / f"responsive_{bp['name']}.jpg"
+            await asyncio.to_thread(screenshot_path.write_bytes, shot)
 
-                // Border colors
-                if (computed.borderColor && computed.borderColor !== 'rgba(0, 0, 0, 0)') {
-                    colors.border.add(computed.borderColor);
-                }
+            return {
+                'viewport': bp,
+                'layout': layout['result']['value'],
+                'screenshot': str(screenshot_path)
+            }
 
-                // Shadow colors
-                if (computed.boxShadow && computed.boxShadow !== 'none') {
-                    // Extract colors from box-shadow
-                    const shadowColors = computed.boxShadow.match(/rgba?\\([^)]+\\)/g);
-                    if (shadowColors) {
-                        shadowColors.forEach(c => colors.shadow.add(c));
-                    }
-                }
-            });
+        results = await asyncio.gather(*(capture(bp) for bp in breakpoints))
+        # A breakpoint whose screenshot or layout never finished is left out
+        return {bp['name']: result for bp, result in zip(breakpoints, results) if result is not None}
 
-            return {
-                textColors: Array.from(colors.text),
-                backgroundColors: Array.from(colors.background),
-                borderColors: Array.from(colors.border),
-                shadowColors: Array.from(colors.shadow),
-                gradients: [...new Set(colors.gradients)]
-            };
-        }
-        """
-        return page.evaluate(script)
-
-    def _extract_typography(self, page: Page) -> Dict[str, Any]:
-        """Extract comprehensive typography system."""
-        script = """
-        () => {
-            const typography = {
-                fonts: new Set(),
-                sizes: new Set(),
-                weights: new Set(),
-                lineHeights: new Set(),
-                letterSpacings: new Set(),
-                textTransforms: new Set(),
-                headings: {},
-                body: {}
-            };
-
-            // Extract from all text elements
-            document.querySelectorAll('h1, h2, h3, h4, h5, h6, p, a, span, button, li, label').forEach(el => {
-                const computed = window.getComputedStyle(el);
-                typography.fonts.add(computed.fontFamily);
-                typography.sizes.add(computed.fontSize);
-                typography.weights.add(computed.fontWeight);
-                typography.lineHeights.add(computed.lineHeight);
-                typography.letterSpacings.add(computed.letterSpacing);
-                if (computed.textTransform !== 'none') {
-                    typography.textTransforms.add(computed.textTransform);
-                }
-            });
 
-            // Extract heading hierarchy
-            ['h1', 'h2', 'h3', 'h4', 'h5', 'h6'].forEach(tag => {
-                const el = document.querySelector(tag);
-                if (el) {
-                    const computed = window.getComputedStyle(el);
-                    typography.headings[tag] = {
-                        fontSize: computed.fontSize,
-                        fontWeight: computed.fontWeight,
-                        lineHeight: computed.lineHeight,
-                        letterSpacing: computed.letterSpacing,
-                        marginTop: computed.marginTop,
-                        marginBottom: computed.marginBottom,
-                        color: computed.color
-                    };
-                }
-            });
+# Opening of the guide, up to the responsive screenshots
+GUIDE_HEADER_TEMPLATE = """# Comprehensive Design Guide
 
-            // Extract body text
-            const body = document.querySelector('p') || document.querySelector('body');
-            if (body) {
-                const computed = window.getComputedStyle(body);
-                typography.body = {
-                    fontSize: computed.fontSize,
-                    fontWeight: computed.fontWeight,
-                    lineHeight: computed.lineHeight,
-                    letterSpacing: computed.letterSpacing,
-                    color: computed.color
-                };
-            }
+**Source URL:** {url}
+**Generated:** Automated comprehensive extraction
+**Viewport:** {viewport[width]}x{viewport[height]}
 
-            return {
-                fonts: Array.from(typography.fonts),
-                sizes: Array.from(typography.sizes).sort((a, b) => parseFloat(a) - parseFloat(b)),
-                weights: Array.from(typography.weights).sort(),
-                lineHeights: Array.from(typography.lineHeights).sort(),
-                letterSpacings: Array.from(typography.letterSpacings),
-                textTransforms: Array.from(typography.textTransforms),
-                headings: typography.headings,
-                body: typography.body
-            };
-        }
-        """
-        return page.evaluate(script)
-
-    def _extract_layout(self, page: Page) -> Dict[str, Any]:
-        """Extract layout and spacing system."""
-        script = """
-        () => {
-            const layout = {
-                margins: new Set(),
-                paddings: new Set(),
-                gaps: new Set(),
-                borderRadii: new Set(),
-                maxWidths: new Set(),
-                containers: []
-            };
-
-            document.querySelectorAll('*').forEach(el => {
-                const computed = window.getComputedStyle(el);
+---
 
-                ['marginTop', 'marginRight', 'marginBottom', 'marginLeft'].forEach(prop => {
-                    if (computed[prop] !== '0px') layout.margins.add(computed[prop]);
-                });
+## 📸 Visual Assets
 
-                ['paddingTop', 'paddingRight', 'paddingBottom', 'paddingLeft'].forEach(prop => {
-                    if (computed[prop] !== '0px') layout.paddings.add(computed[prop]);
-                });
+### Screenshots
+- **Desktop Viewport:** `{viewport_screenshot}`
+- **Full Page:** `{fullpage_screenshot}`
+- **Interactive States:** `interactive_hover.png`
 
-                if (computed.gap !== 'normal' && computed.gap !== '0px') layout.gaps.add(computed.gap);
-                if (computed.borderRadius !== '0px') layout.borderRadii.add(computed.borderRadius);
-                if (computed.maxWidth !== 'none') layout.maxWidths.add(computed.maxWidth);
-
-                // Identify container patterns
-                if (computed.maxWidth !== 'none' && computed.marginLeft === 'auto' && computed.marginRight === 'auto') {
-                    const rect = el.getBoundingClientRect();
-                    if (rect.width > 500) {
-                        layout.containers.push({
-                            maxWidth: computed.maxWidth,
-                            padding: computed.padding,
-                            width: rect.width + 'px'
-                        });
-                    }
-                }
-            });
+"""
 
-            return {
-                margins: Array.from(layout.margins).sort((a, b) => parseFloat(a) - parseFloat(b)),
-                paddings: Array.from(layout.paddings).sort((a, b) => parseFloat(a) - parseFloat(b)),
-                gaps: Array.from(layout.gaps).sort((a, b) => parseFloat(a) - parseFloat(b)),
-                borderRadii: Array.from(layout.borderRadii).sort((a, b) => parseFloat(a) - parseFloat(b)),
-                maxWidths: Array.from(layout.maxWidths),
-                containers: layout.containers.slice(0, 5)
-            };
-        }
-        """
-        return page.evaluate(script)
-
-    def _extract_animations(self, page: Page) -> Dict[str, Any]:
-        """Extract animations and transitions."""
-        script = """
-        () => {
-            const animations = {
-                transitions: new Set(),
-                keyframes: [],
-                animatedElements: []
-            };
-
-            document.querySelectorAll('*').forEach((el, idx) => {
-                const computed = window.getComputedStyle(el);
+# Fixed closing sections of the guide, written as-is
+GUIDE_FOOTER = """---
 
-                if (computed.transition !== 'all 0s ease 0s' && computed.transition !== 'none') {
-                    animations.transitions.add(computed.transition);
-                }
+## 🚀 Implementation Recommendations
 
-                if (computed.animation !== 'none') {
-                    const rect = el.getBoundingClientRect();
-                    if (rect.width > 0 && rect.height > 0) {
-                        animations.animatedElements.push({
-                            selector: el.tagName.toLowerCase() + (el.className ? '.' + Array.from(el.classList).join('.') : ''),
-                            animation: computed.animation
-                        });
-                    }
-                }
-            });
 
-            // Extract keyframes from stylesheets
-            for (const sheet of document.styleSheets) {
-                try {
-                    for (const rule of sheet.cssRules) {
-                        if (rule.type === CSSRule.KEYFRAMES_RULE) {
-                            animations.keyframes.push({
-                                name: rule.name,
-                                rules: Array.from(rule.cssRules).map(r => r.cssText)
-                            });
-                        }
-                    }
-                } catch (e) {
-                    // CORS restrictions
-                }
-            }
+### Step 1: Define Design Tokens
 
-            return {
-                transitions: Array.from(animations.transitions),
-                keyframes: animations.keyframes,
-                animatedElements: animations.animatedElements.slice(0, 10)
-            };
-        }
-        """
-        return page.evaluate(script)
-
-    def _extract_effects(self, page: Page) -> Dict[str, Any]:
-        """Extract visual effects like shadows, filters, transforms."""
-        script = """
-        () => {
-            const effects = {
-                boxShadows: new Set(),
-                textShadows: new Set(),
-                filters: new Set(),
-                transforms: new Set(),
-                opacities: new Set()
-            };
-
-            document.querySelectorAll('*').forEach(el => {
-                const computed = window.getComputedStyle(el);
+Create a comprehensive token system using CSS custom properties:
 
-                if (computed.boxShadow !== 'none') {
-                    effects.boxShadows.add(computed.boxShadow);
-                }
-                if (computed.textShadow !== 'none') {
-                    effects.textShadows.add(computed.textShadow);
-                }
-                if (computed.filter !== 'none') {
-                    effects.filters.add(computed.filter);
-                }
-                if (computed.transform !== 'none') {
-                    effects.transforms.add(computed.transform);
-                }
-                if (computed.opacity !== '1') {
-                    effects.opacities.add(computed.opacity);
-                }
-            });
+```css
+:root {
+  /* Use the color, typography, and spacing values above */
+}
+```
 
-            return {
-                boxShadows: Array.from(effects.boxShadows),
-                textShadows: Array.from(effects.textShadows),
-                filters: Array.from(effects.filters),
-                transforms: Array.from(effects.transforms),
-                opacities: Array.from(effects.opacities).sort()
-            };
-        }
-        """
-        return page.evaluate(script)
-
-    def _identify_components(self, page: Page) -> Dict[str, Any]:
-        """Identify common UI components and patterns."""
-        script = """
-        () => {
-            const components = {
-                buttons: [],
-                cards: [],
-                navbars: [],
-                forms: [],
-                modals: [],
-                badges: [],
-                alerts: []
-            };
-
-            // Buttons
-            document.querySelectorAll('button, [role="button"], a.btn, a.button, input[type="button"], input[type="submit"]').forEach((el, idx) => {
-                if (idx < 5) {
-                    const computed = window.getComputedStyle(el);
-                    components.buttons.push({
-                        text: el.textContent.trim().substring(0, 30),
-                        styles: {
-                            backgroundColor: computed.backgroundColor,
-                            color: computed.color,
-                            padding: computed.padding,
-                            borderRadius: computed.borderRadius,
-                            border: computed.border,
-                            fontSize: computed.fontSize,
-                            fontWeight: computed.fontWeight
-                        }
-                    });
-                }
-            });
+### Step 2: Implement Component Patterns
 
-            // Cards (common patterns)
-            document.querySelectorAll('[class*="card"], .article, article, [class*="post"]').forEach((el, idx) => {
-                if (idx < 3) {
-                    const computed = window.getComputedStyle(el);
-                    const rect = el.getBoundingClientRect();
-                    if (rect.width > 200 && rect.height > 100) {
-                        components.cards.push({
-                            styles: {
-                                backgroundColor: computed.backgroundColor,
-                                borderRadius: computed.borderRadius,
-                                boxShadow: computed.boxShadow,
-                                padding: computed.padding,
-                                border: computed.border
-                            }
-                        });
-                    }
-                }
-            });
+Use the extracted component styles for buttons, cards, forms, etc.
 
-            // Navigation
-            document.querySelectorAll('nav, [role="navigation"], header nav').forEach((el, idx) => {
-                if (idx < 2) {
-                    const computed = window.getComputedStyle(el);
-                    components.navbars.push({
-                        styles: {
-                            backgroundColor: computed.backgroundColor,
-                            height: computed.height,
-                            position: computed.position,
-                            boxShadow: computed.boxShadow,
-                            padding: computed.padding
-                        }
-                    });
-                }
-            });
+### Step 3: Apply Interactive States
 
-            // Forms
-            document.querySelectorAll('form, input, select, textarea').forEach((el, idx) => {
-                if (idx < 5) {
-                    const computed = window.getComputedStyle(el);
-                    components.forms.push({
-                        type: el.tagName.toLowerCase(),
-                        styles: {
-                            backgroundColor: computed.backgroundColor,
-                            border: computed.border,
-                            borderRadius: computed.borderRadius,
-                            padding: computed.padding,
-                            fontSize: computed.fontSize
-                        }
-                    });
-                }
-            });
+Implement hover, focus, and active states as documented above.
 
-            return components;
-        }
-        """
-        return page.evaluate(script)
+### Step 4: Add Animations
 
-    def _analyze_ux_patterns(self, page: Page) -> Dict[str, Any]:
-        """Analyze UX patterns and behaviors."""
-        script = """
-        () => {
-            const patterns = {
-                scrollBehavior: window.getComputedStyle(document.documentElement).scrollBehavior,
-                focusVisible: [],
-                cursorStyles: new Set(),
-                interactiveElements: 0,
-                accessibilityFeatures: {
-                    ariaLabels: document.querySelectorAll('[aria-label]').length,
-                    ariaDescriptions: document.querySelectorAll('[aria-describedby]').length,
-                    roles: document.querySelectorAll('[role]').length,
-                    alts: document.querySelectorAll('img[alt]').length
-                }
-            };
+Apply the transitions and keyframe animations for smooth interactions.
 
-            // Cursor styles
-            document.querySelectorAll('*').forEach(el => {
-                const cursor = window.getComputedStyle(el).cursor;
-                if (cursor !== 'auto') {
-                    patterns.cursorStyles.add(cursor);
-                }
-            });
+### Step 5: Ensure Responsive Behavior
 
-            // Interactive elements count
-            patterns.interactiveElements = document.querySelectorAll('a, button, input, select, textarea, [onclick], [tabindex]').length;
-
-            // Check for sticky elements
-            patterns.stickyElements = [];
-            document.querySelectorAll('*').forEach(el => {
-                const position = window.getComputedStyle(el).position;
-                if (position === 'sticky' || position === 'fixed') {
-                    patterns.stickyElements.push({
-                        tagName: el.tagName.toLowerCase(),
-                        position: position,
-                        top: window.getComputedStyle(el).top,
-                        zIndex: window.getComputedStyle(el).zIndex
-                    });
-                }
-            });
+Use the responsive patterns to create mobile-first, adaptive layouts.
 
-            return {
-                ...patterns,
-                cursorStyles: Array.from(patterns.cursorStyles),
-                stickyElements: patterns.stickyElements.slice(0, 5)
-            };
-        }
-        """
-        return page.evaluate(script)
+### Step 6: Test Accessibility
 
-    def _test_responsive(self, page: Page, output_dir: Path) -> Dict[str, Any]:
-        """Test responsive behavior at different breakpoints."""
-        breakpoints = [
-            {'name': 'mobile', 'width': 375, 'height': 812},
-            {'name': 'tablet', 'width': 768, 'height': 1024},
-            {'name': 'desktop', 'width': 1920, 'height': 1080}
-        ]
+Follow the accessibility patterns identified in the analysis.
 
-        responsive_data = {}
+---
 
-        for bp in breakpoints:
-            page.set_viewport_size({'width': bp['width'], 'height': bp['height']})
-            page.wait_for_timeout(500)
+## 📚 Files Reference
 
-            # Take screenshot
-            screenshot_path = output_dir / f"responsive_{bp['name']}.png"
-            page.screenshot(path=str(screenshot_path))
+- `design-guide.md` - This comprehensive guide
+- `design_data.json` - Complete raw data
+- `extracted.html` - Original HTML
+- `extracted.css` - All CSS styles
+- `computed_styles.json` - Computed styles per element (evenly sampled on very large pages)
+- `interactive_hover.png` - Hover state captures
+- `responsive_*.jpg` - Responsive screenshots
 
-            # Get layout info at this breakpoint
-            layout_script = """
-            () => {
-                const body = document.body;
-                const html = document.documentElement;
-                return {
-                    viewportWidth: window.innerWidth,
-                    viewportHeight: window.innerHeight,
-                    scrollHeight: Math.max(body.scrollHeight, html.scrollHeight),
-                    bodyWidth: body.getBoundingClientRect().width
-                };
-            }
-            """
-            responsive_data[bp['name']] = {
-                'viewport': bp,
-                'layout': page.evaluate(layout_script),
-                'screenshot': str(screenshot_path)
-            }
+---
 
-        # Reset to original viewport
-        page.set_viewport_size({'width': self.viewport_width, 'height': self.viewport_height})
+**Last Updated:** Auto-generated
+**Extraction Completeness:** Comprehensive
+"""
 
-        return responsive_data
+# Per-item guide blocks, formatted with format_map over the item's own dict
+# (nested values are reached with {styles[color]}-style fields)
+HOVER_TEMPLATE = """#### {index}. `{selector}`
 
+**Default State:**
+- Background: `{default[backgroundColor]}`
+- Color: `{default[color]}`
+- Transform: `{default[transform]}`
+- Box Shadow: `{default[boxShadow]}`
 
-def generate_design_guide(data: Dict[str, Any], output_dir: Path) -> str:
-    """Generate comprehensive design guide with all extracted patterns."""
+**Hover State:**
+- Background: `{hover[backgroundColor]}`
+- Color: `{hover[color]}`
+- Transform: `{hover[transform]}`
+- Box Shadow: `{hover[boxShadow]}`
 
-    guide = f"""# Comprehensive Design Guide
+"""
 
-**Source URL:** {data['url']}
-**Generated:** Automated comprehensive extraction
-**Viewport:** {data['viewport']['width']}x{data['viewport']['height']}
+BUTTON_TEMPLATE = """#### Button {index}: "{text}"
 
----
+```css
+background-color: {styles[backgroundColor]};
+color: {styles[color]};
+padding: {styles[padding]};
+border-radius: {styles[borderRadius]};
+border: {styles[border]};
+font-size: {styles[fontSize]};
+font-weight: {styles[fontWeight]};
+```
 
-## 📸 Visual Assets
+"""
 
-### Screenshots
-- **Desktop Viewport:** `{Path(data['screenshots']['viewport']).name}`
-- **Full Page:** `{Path(data['screenshots']['fullpage']).name}`
-- **Interactive States:** `interactive_hover.png`
+CARD_TEMPLATE = """#### Card Pattern {index}
+
+```css
+background-color: {styles[backgroundColor]};
+border-radius: {styles[borderRadius]};
+box-shadow: {styles[boxShadow]};
+padding: {styles[padding]};
+```
 
-### Responsive Screenshots
 """
 
-    for device, info in data.get('responsive', {}).items():
-        guide += f"- **{device.title()} ({info['viewport']['width']}x{info['viewport']['height']}):** `responsive_{device}.png`\n"
 
-    # Color System
-    guide += "\n---\n\n## 🎨 Color System\n\n"
-    guide += "### Primary Colors\n\n"
-    guide += "```css\n:root {\n"
+def _write_colors(data: Dict[str, Any], write: Callable[[str], Any]) -> None:
+    colors = data['colors']
+    write("### Primary Colors\n\n")
+    write("```css\n:root {\n")
 
     # Text colors
-    guide += "  /* Text Colors */\n"
-    for i, color in enumerate(data['colors']['textColors'][:5], 1):
-        guide += f"  --text-{i}: {color};\n"
+    write("  /* Text Colors */\n")
+    for i, color in enumerate(islice(colors['textColors'], 5), 1):
+        write(f"  --text-{i}: {color};\n")
 
     # Background colors
-    guide += "\n  /* Background Colors */\n"
-    for i, color in enumerate(data['colors']['backgroundColors'][:5], 1):
-        guide += f"  --bg-{i}: {color};\n"
+    write("\n  /* Background Colors */\n")
+    for i, color in enumerate(islice(colors['backgroundColors'], 5), 1):
+        write(f"  --bg-{i}: {color};\n")
 
     # Border colors
-    guide += "\n  /* Border Colors */\n"
-    for i, color in enumerate(data['colors']['borderColors'][:5], 1):
-        guide += f"  --border-{i}: {color};\n"
+    write("\n  /* Border Colors */\n")
+    for i, color in enumerate(islice(colors['borderColors'], 5), 1):
+        write(f"  --border-{i}: {color};\n")
 
-    guide += "}\n```\n\n"
+    write("}\n```\n\n")
 
     # Gradients
-    if data['colors'].get('gradients'):
-        guide += "### Gradients\n\n"
-        for i, gradient in enumerate(data['colors']['gradients'][:5], 1):
-            guide += f"{i}. `{gradient}`\n"
-        guide += "\n"
+    if colors.get('gradients'):
+        write("### Gradients\n\n")
+        for i, gradient in enumerate(islice(colors['gradients'], 5), 1):
+            write(f"{i}. `{gradient}`\n")
+        write("\n")
 
     # Shadow colors
-    if data['colors'].get('shadowColors'):
-        guide += "### Shadow Colors\n\n"
-        for color in data['colors']['shadowColors'][:5]:
-            guide += f"- `{color}`\n"
-        guide += "\n"
-
-    # Typography
-    guide += "---\n\n## 📝 Typography System\n\n"
-    guide += "### Font Stack\n\n"
-    guide += "```css\n:root {\n"
-    for i, font in enumerate(data['typography']['fonts'][:3], 1):
-        guide += f"  --font-{i}: {font};\n"
-    guide += "}\n```\n\n"
+    if colors.get('shadowColors'):
+        write("### Shadow Colors\n\n")
+        for color in islice(colors['shadowColors'], 5):
+            write(f"- `{color}`\n")
+        write("\n")
+
+
+def _write_typography(data: Dict[str, Any], write: Callable[[str], Any]) -> None:
+    typography = data['typography']
+    write("### Font Stack\n\n")
+    write("```css\n:root {\n")
+    for i, font in enumerate(islice(typography['fonts'], 3), 1):
+        write(f"  --font-{i}: {font};\n")
+    write("}\n```\n\n")
 
     # Type scale
-    guide += "### Type Scale\n\n"
-    guide += "```css\n:root {\n"
-    for i, size in enumerate(data['typography']['sizes'][:10], 1):
-        guide += f"  --text-{i}: {size};\n"
-    guide += "}\n```\n\n"
+    write("### Type Scale\n\n")
+    write("```css\n:root {\n")
+    for i, size in enumerate(islice(typography['sizes'], 10), 1):
+        write(f"  --text-{i}: {size};\n")
+    write("}\n```\n\n")
 
     # Heading hierarchy
-    if data['typography'].get('headings'):
-        guide += "### Heading Hierarchy\n\n"
-        guide += "| Element | Font Size | Weight | Line Height | Letter Spacing |\n"
-        guide += "|---------|-----------|--------|-------------|----------------|\n"
-        for tag, styles in data['typography']['headings'].items():
-            guide += f"| {tag} | {styles.get('fontSize', 'N/A')} | {styles.get('fontWeight', 'N/A')} | {styles.get('lineHeight', 'N/A')} | {styles.get('letterSpacing', 'N/A')} |\n"
-        guide += "\n"
+    if typography.get('headings'):
+        write("### Heading Hierarchy\n\n")
+        write("| Element | Font Size | Weight | Line Height | Letter Spacing |\n")
+        write("|---------|-----------|--------|-------------|----------------|\n")
+        rows = [
+            f"| {tag} | {styles.get('fontSize', 'N/A')} | {styles.get('fontWeight', 'N/A')} | {styles.get('lineHeight', 'N/A')} | {styles.get('letterSpacing', 'N/A')} |"
+            for tag, styles in typography['headings'].items()
+        ]
+        write("\n".join(rows))
+        write("\n\n")
 
     # Font weights
-    guide += "### Font Weights\n\n"
-    for weight in data['typography']['weights']:
-        guide += f"- `{weight}`\n"
-    guide += "\n"
+    write("### Font Weights\n\n")
+    for weight in typography['weights']:
+        write(f"- `{weight}`\n")
+    write("\n")
+
 
-    # Spacing & Layout
-    guide += "---\n\n## 📐 Spacing & Layout\n\n"
-    guide += "### Spacing Scale\n\n"
-    guide += "```css\n:root {\n"
+def _write_layout(data: Dict[str, Any], write: Callable[[str], Any]) -> None:
+    layout = data['layout']
+    write("### Spacing Scale\n\n")
+    write("```css\n:root {\n")
 
     # Margins
-    guide += "  /* Margins */\n"
-    for i, margin in enumerate(data['layout']['margins'][:10], 1):
-        guide += f"  --margin-{i}: {margin};\n"
+    write("  /* Margins */\n")
+    for i, margin in enumerate(islice(layout['margins'], 10), 1):
+        write(f"  --margin-{i}: {margin};\n")
 
     # Paddings
-    guide += "\n  /* Paddings */\n"
-    for i, padding in enumerate(data['layout']['paddings'][:10], 1):
-        guide += f"  --padding-{i}: {padding};\n"
+    write("\n  /* Paddings */\n")
+    for i, padding in enumerate(islice(layout['paddings'], 10), 1):
+        write(f"  --padding-{i}: {padding};\n")
 
     # Gaps
-    if data['layout'].get('gaps'):
-        guide += "\n  /* Gaps (Flexbox/Grid) */\n"
-        for i, gap in enumerate(data['layout']['gaps'][:5], 1):
-            guide += f"  --gap-{i}: {gap};\n"
+    if layout.get('gaps'):
+        write("\n  /* Gaps (Flexbox/Grid) */\n")
+        for i, gap in enumerate(islice(layout['gaps'], 5), 1):
+            write(f"  --gap-{i}: {gap};\n")
 
-    guide += "}\n```\n\n"
+    write("}\n```\n\n")
 
     # Border radius
-    if data['layout'].get('borderRadii'):
-        guide += "### Border Radius\n\n"
-        guide += "```css\n:root {\n"
-        for i, radius in enumerate(data['layout']['borderRadii'][:8], 1):
-            guide += f"  --radius-{i}: {radius};\n"
-        guide += "}\n```\n\n"
+    if layout.get('borderRadii'):
+        write("### Border Radius\n\n")
+        write("```css\n:root {\n")
+        for i, radius in enumerate(islice(layout['borderRadii'], 8), 1):
+            write(f"  --radius-{i}: {radius};\n")
+        write("}\n```\n\n")
 
     # Container patterns
-    if data['layout'].get('containers'):
-        guide += "### Container Patterns\n\n"
-        for i, container in enumerate(data['layout']['containers'], 1):
-            guide += f"{i}. **Max Width:** `{container['maxWidth']}`, **Padding:** `{container['padding']}`\n"
-        guide += "\n"
+    if layout.get('containers'):
+        write("### Container Patterns\n\n")
+        for i, container in enumerate(layout['containers'], 1):
+            write(f"{i}. **Max Width:** `{container['maxWidth']}`, **Padding:** `{container['padding']}`\n")
+        write("\n")
 
-    # Visual Effects
-    guide += "---\n\n## 🌟 Visual Effects\n\n"
+
+def _write_effects(data: Dict[str, Any], write: Callable[[str], Any]) -> None:
+    effects = data['effects']
 
     # Box shadows
-    if data['effects'].get('boxShadows'):
-        guide += "### Box Shadows\n\n"
-        guide += "```css\n"
-        for i, shadow in enumerate(data['effects']['boxShadows'][:5], 1):
-            guide += f"/* Shadow {i} */\nbox-shadow: {shadow};\n\n"
-        guide += "```\n\n"
+    if effects.get('boxShadows'):
+        write("### Box Shadows\n\n")
+        write("```css\n")
+        for i, shadow in enumerate(islice(effects['boxShadows'], 5), 1):
+            write(f"/* Shadow {i} */\nbox-shadow: {shadow};\n\n")
+        write("```\n\n")
 
     # Filters
-    if data['effects'].get('filters'):
-        guide += "### Filters\n\n"
-        for filter_val in data['effects']['filters'][:5]:
-            guide += f"- `{filter_val}`\n"
-        guide += "\n"
+    if effects.get('filters'):
+        write("### Filters\n\n")
+        for filter_val in islice(effects['filters'], 5):
+            write(f"- `{filter_val}`\n")
+        write("\n")
 
     # Opacities
-    if data['effects'].get('opacities'):
-        guide += "### Opacity Values\n\n"
-        for opacity in data['effects']['opacities'][:8]:
-            guide += f"- `{opacity}`\n"
-        guide += "\n"
+    if effects.get('opacities'):
+        write("### Opacity Values\n\n")
+        for opacity in islice(effects['opacities'], 8):
+            write(f"- `{opacity}`\n")
+        write("\n")
+
 
-    # Animations & Transitions
-    guide += "---\n\n## ✨ Animations & Transitions\n\n"
+def _write_animations(data: Dict[str, Any], write: Callable[[str], Any]) -> None:
+    animations = data['animations']
 
     # Transitions
-    if data['animations'].get('transitions'):
-        guide += "### Transitions\n\n"
-        guide += "```css\n"
-        for i, transition in enumerate(data['animations']['transitions'][:8], 1):
-            guide += f"/* Transition {i} */\ntransition: {transition};\n\n"
-        guide += "```\n\n"
+    if animations.get('transitions'):
+        write("### Transitions\n\n")
+        write("```css\n")
+        for i, transition in enumerate(islice(animations['transitions'], 8), 1):
+            write(f"/* Transition {i} */\ntransition: {transition};\n\n")
+        write("```\n\n")
 
     # Keyframe animations
-    if data['animations'].get('keyframes'):
-        guide += "### Keyframe Animations\n\n"
-        for kf in data['animations']['keyframes'][:3]:
-            guide += f"#### @keyframes {kf['name']}\n\n"
-            guide += "```css\n"
-            for rule in kf['rules'][:5]:
-                guide += f"{rule}\n"
-            guide += "```\n\n"
-
-    # Interactive States
-    guide += "---\n\n## ⚡ Interactive States\n\n"
-
-    if data['interactive_states'].get('hover_samples'):
-        guide += "### Hover Effects\n\n"
-        guide += "Captured hover states for interactive elements:\n\n"
-        for i, state in enumerate(data['interactive_states']['hover_samples'][:5], 1):
-            guide += f"#### {i}. `{state['selector']}`\n\n"
-            guide += "**Default State:**\n"
-            guide += f"- Background: `{state['default']['backgroundColor']}`\n"
-            guide += f"- Color: `{state['default']['color']}`\n"
-            guide += f"- Transform: `{state['default']['transform']}`\n"
-            guide += f"- Box Shadow: `{state['default']['boxShadow']}`\n\n"
-            guide += "**Hover State:**\n"
-            guide += f"- Background: `{state['hover']['backgroundColor']}`\n"
-            guide += f"- Color: `{state['hover']['color']}`\n"
-            guide += f"- Transform: `{state['hover']['transform']}`\n"
-            guide += f"- Box Shadow: `{state['hover']['boxShadow']}`\n\n"
-
-    # Component Patterns
-    guide += "---\n\n## 🧩 Component Patterns\n\n"
+    if animations.get('keyframes'):
+        write("### Keyframe Animations\n\n")
+        for kf in islice(animations['keyframes'], 3):
+            write(f"#### @keyframes {kf['name']}\n\n")
+            write("```css\n")
+            for rule in islice(kf['rules'], 5):
+                write(f"{rule}\n")
+            write("```\n\n")
 
-    # Buttons
-    if data['components'].get('buttons'):
-        guide += "### Buttons\n\n"
-        for i, btn in enumerate(data['components']['buttons'][:3], 1):
-            guide += f"#### Button {i}: \"{btn['text']}\"\n\n"
-            guide += "```css\n"
-            guide += f"background-color: {btn['styles']['backgroundColor']};\n"
-            guide += f"color: {btn['styles']['color']};\n"
-            guide += f"padding: {btn['styles']['padding']};\n"
-            guide += f"border-radius: {btn['styles']['borderRadius']};\n"
-            guide += f"border: {btn['styles']['border']};\n"
-            guide += f"font-size: {btn['styles']['fontSize']};\n"
-            guide += f"font-weight: {btn['styles']['fontWeight']};\n"
-            guide += "```\n\n"
 
-    # Cards
-    if data['components'].get('cards'):
-        guide += "### Cards\n\n"
-        for i, card in enumerate(data['components']['cards'][:3], 1):
-            guide += f"#### Card Pattern {i}\n\n"
-            guide += "```css\n"
-            guide += f"background-color: {card['styles']['backgroundColor']};\n"
-            guide += f"border-radius: {card['styles']['borderRadius']};\n"
-            guide += f"box-shadow: {card['styles']['boxShadow']};\n"
-            guide += f"padding: {card['styles']['padding']};\n"
-            guide += "```\n\n"
-
-    # UX Patterns
-    guide += "---\n\n## 🎭 UX Patterns\n\n"
-
-    guide += f"### Interaction Metrics\n\n"
-    guide += f"- **Interactive Elements:** {data['ux_patterns'].get('interactiveElements', 0)}\n"
-    guide += f"- **Scroll Behavior:** `{data['ux_patterns'].get('scrollBehavior', 'auto')}`\n"
-    guide += f"- **Cursor Styles Used:** {', '.join([f'`{c}`' for c in data['ux_patterns'].get('cursorStyles', [])])}\n\n"
+def _write_interactive_states(data: Dict[str, Any], write: Callable[[str], Any]) -> None:
+    write("### Hover Effects\n\n")
+    write("Captured hover states for interactive elements:\n\n")
+    for i, state in enumerate(islice(data['interactive_states']['hover_samples'], 5), 1):
+        write(HOVER_TEMPLATE.format_map({'index': i, **state}))
 
-    # Accessibility
-    if data['ux_patterns'].get('accessibilityFeatures'):
-        guide += "### Accessibility Features\n\n"
-        features = data['ux_patterns']['accessibilityFeatures']
-        guide += f"- ARIA Labels: {features.get('ariaLabels', 0)}\n"
-        guide += f"- ARIA Descriptions: {features.get('ariaDescriptions', 0)}\n"
-        guide += f"- Role Attributes: {features.get('roles', 0)}\n"
-        guide += f"- Image Alt Texts: {features.get('alts', 0)}\n\n"
 
-    # Sticky elements
-    if data['ux_patterns'].get('stickyElements'):
-        guide += "### Sticky/Fixed Elements\n\n"
-        for elem in data['ux_patterns']['stickyElements']:
-            guide += f"- `{elem['tagName']}` - Position: `{elem['position']}`, Top: `{elem['top']}`, Z-Index: `{elem['zIndex']}`\n"
-        guide += "\n"
+def _write_components(data: Dict[str, Any], write: Callable[[str], Any]) -> None:
+    components = data['components']
 
-    # Responsive Patterns
-    guide += "---\n\n## 📱 Responsive Design\n\n"
-
-    for device, info in data.get('responsive', {}).items():
-        guide += f"### {device.title()} ({info['viewport']['width']}x{info['viewport']['height']})\n\n"
-        guide += f"- Viewport: {info['layout']['viewportWidth']}x{info['layout']['viewportHeight']}\n"
-        guide += f"- Scroll Height: {info['layout']['scrollHeight']}px\n"
-        guide += f"- Body Width: {info['layout']['bodyWidth']}px\n"
-        guide += f"- Screenshot: `{Path(info['screenshot']).name}`\n\n"
-
-    # Implementation Guide
-    guide += "---\n\n## 🚀 Implementation Recommendations\n\n"
-    guide += """
-### Step 1: Define Design Tokens
-
-Create a comprehensive token system using CSS custom properties:
-
-```css
-:root {
-  /* Use the color, typography, and spacing values above */
-}
-```
-
-### Step 2: Implement Component Patterns
-
-Use the extracted component styles for buttons, cards, forms, etc.
-
-### Step 3: Apply Interactive States
-
-Implement hover, focus, and active states as documented above.
-
-### Step 4: Add Animations
-
-Apply the transitions and keyframe animations for smooth interactions.
-
-### Step 5: Ensure Responsive Behavior
-
-Use the responsive patterns to create mobile-first, adaptive layouts.
+    # Buttons
+    if components.get('buttons'):
+        write("### Buttons\n\n")
+        for i, btn in enumerate(islice(components['buttons'], 3), 1):
+            write(BUTTON_TEMPLATE.format_map({'index': i, **btn}))
 
-### Step 6: Test Accessibility
+    # Cards
+    if components.get('cards'):
+        write("### Cards\n\n")
+        for i, card in enumerate(islice(components['cards'], 3), 1):
+            write(CARD_TEMPLATE.format_map({'index': i, **card}))
 
-Follow the accessibility patterns identified in the analysis.
 
----
+def _write_ux_patterns(data: Dict[str, Any], write: Callable[[str], Any]) -> None:
+    ux_patterns = data['ux_patterns']
+    write(f"### Interaction Metrics\n\n")
+    write(f"- **Interactive Elements:** {ux_patterns.get('interactiveElements', 0)}\n")
+    write(f"- **Scroll Behavior:** `{ux_patterns.get('scrollBehavior', 'auto')}`\n")
+    write(f"- **Cursor Styles Used:** {', '.join([f'`{c}`' for c in ux_patterns.get('cursorStyles', [])])}\n\n")
 
-## 📚 Files Reference
+    # Accessibility
+    if ux_patterns.get('accessibilityFeatures'):
+        write("### Accessibility Features\n\n")
+        features = ux_patterns['accessibilityFeatures']
+        write(f"- ARIA Labels: {features.get('ariaLabels', 0)}\n")
+        write(f"- ARIA Descriptions: {features.get('ariaDescriptions', 0)}\n")
+        write(f"- Role Attributes: {features.get('roles', 0)}\n")
+        write(f"- Image Alt Texts: {features.get('alts', 0)}\n\n")
 
-- `design-guide.md` - This comprehensive guide
-- `design_data.json` - Complete raw data
-- `extracted.html` - Original HTML
-- `extracted.css` - All CSS styles
-- `computed_styles.json` - Computed styles for every element
-- `interactive_hover.png` - Hover state captures
-- `responsive_*.png` - Responsive screenshots
+    # Sticky elements
+    if ux_patterns.get('stickyElements'):
+        write("### Sticky/Fixed Elements\n\n")
+        for elem in ux_patterns['stickyElements']:
+            write(f"- `{elem['tagName']}` - Position: `{elem['position']}`, Top: `{elem['top']}`, Z-Index: `{elem['zIndex']}`\n")
+        write("\n")
+
+
+def _has_any(section: str, *keys: str):
+    """Predicate that is true when any of the given lists of a data section is non-empty."""
+    return lambda data: any(data[section].get(key) for key in keys)
+
+
+# The data-driven guide sections, in order: (title, writer, predicate). A
+# section whose predicate is false is left out entirely rather than written
+# as an empty heading.
+GUIDE_SECTIONS = [
+    ("🎨 Color System", _write_colors,
+     _has_any('colors', 'textColors', 'backgroundColors', 'borderColors', 'gradients', 'shadowColors')),
+    ("📝 Typography System", _write_typography, _has_any('typography', 'fonts', 'sizes', 'headings', 'weights')),
+    ("📐 Spacing & Layout", _write_layout,
+     _has_any('layout', 'margins', 'paddings', 'gaps', 'borderRadii', 'containers')),
+    ("🌟 Visual Effects", _write_effects, _has_any('effects', 'boxShadows', 'filters', 'opacities')),
+    ("✨ Animations & Transitions", _write_animations, _has_any('animations', 'transitions', 'keyframes')),
+    ("⚡ Interactive States", _write_interactive_states, _has_any('interactive_states', 'hover_samples')),
+    ("🧩 Component Patterns", _write_components, _has_any('components', 'buttons', 'cards')),
+    ("🎭 UX Patterns", _write_ux_patterns, lambda data: True),
+]
+
+
+def generate_design_guide(data: Dict[str, Any], output_dir: Path, out: TextIO) -> None:
+    """Generate comprehensive design guide with all extracted patterns.
+
+    Each section is written to out as it is produced, so the guide is never
+    held in memory as a whole.
+    """
+    write = out.write
+    responsive = data.get('responsive', {})
+
+    write(GUIDE_HEADER_TEMPLATE.format(
+        url=data['url'],
+        viewport=data['viewport'],
+        viewport_screenshot=basename(data['screenshots']['viewport']),
+        fullpage_screenshot=basename(data['screenshots']['fullpage'])
+    ))
+
+    # One pass over the breakpoints feeds both responsive sections; the
+    # detailed one is held until its place near the end of the guide
+    responsive_details = []
+    if responsive:
+        write("### Responsive Screenshots\n")
+    for device, info in responsive.items():
+        viewport, measured = info['viewport'], info['layout']
+        title = f"{device.title()} ({viewport['width']}x{viewport['height']})"
+        screenshot = basename(info['screenshot'])
+        write(f"- **{title}:** `{screenshot}`\n")
+        responsive_details.append(
+            f"### {title}\n\n"
+            f"- Viewport: {measured['viewportWidth']}x{measured['viewportHeight']}\n"
+            f"- Scroll Height: {measured['scrollHeight']}px\n"
+            f"- Body Width: {measured['bodyWidth']}px\n"
+            f"- Screenshot: `{screenshot}`\n\n"
+        )
+    if responsive:
+        write("\n")
 
----
+    for title, write_section, wanted in GUIDE_SECTIONS:
+        if wanted(data):
+            write(f"---\n\n## {title}\n\n")
+            write_section(data, write)
 
-**Last Updated:** {click.style('Auto-generated', fg='cyan')}
-**Extraction Completeness:** {click.style('Comprehensive', fg='green')}
-"""
+    # Responsive Patterns
+    if responsive_details:
+        write("---\n\n## 📱 Responsive Design\n\n")
+        out.writelines(responsive_details)
 
-    return guide
+    # Implementation Guide
+    write(GUIDE_FOOTER)
+
+
+def write_design_guide(data: Dict[str, Any], output_dir: Path) -> None:
+    """Generate the design guide for extracted data, save it and report the outputs."""
+    # Generate comprehensive design guide
+    click.echo()
+    click.echo(click.style("📝 Generating comprehensive design guide...", fg="cyan", bold=True))
+    guide_path = output_dir / "design-guide.md"
+    with guide_path.open('w', encoding='utf-8') as out:
+        generate_design_guide(data, output_dir, out)
+
+    click.echo()
+    click.echo(click.style("✅ Comprehensive design guide generated!", fg="green", bold=True))
+    click.echo()
+    click.echo(f"📁 Output directory: {click.style(str(output_dir.absolute()), fg='blue', bold=True)}")
+    click.echo(f"📄 Design guide: {click.style(str(guide_path.name), fg='blue')}")
+    click.echo(f"📊 Design data: {click.style('design_data.json', fg='blue')}")
+    screenshots = ['viewport', 'fullpage']
+    if data.get('responsive'):
+        screenshots.append(f"responsive ({'/'.join(data['responsive'])})")
+    screenshots.append('hover states')
+    click.echo(f"📸 Screenshots: {click.style(', '.join(screenshots), fg='blue')}")
+    click.echo(f"📦 Extracted files: {click.style('HTML, CSS, computed styles', fg='blue')}")
+    click.echo()
+    click.echo(click.style("💡 Tip:", fg="yellow") + " View all assets with: cd " + str(output_dir) + " && python3 -m http.server 8080")
+
+
+def url_output_dir(output_dir: Path, url: str) -> Path:
+    """Return the output subdirectory for one of several URLs, named after its host and path."""
+    parsed = urlparse(url)
+    return output_dir / (re.sub(r'[^A-Za-z0-9.-]+', '-', parsed.netloc + parsed.path).strip('-') or 'site')
+
+
+async def generate_guides(urls: List[str], output_dir: Path, viewport_width: int, viewport_height: int,
+                          max_elements: int, breakpoints: Sequence[str]) -> None:
+    """Extract each URL and write its design guide, sharing one browser process."""
+    async with launch_browser() as browser:
+        for url in urls:
+            url_dir = output_dir if len(urls) == 1 else url_output_dir(output_dir, url)
+            url_dir.mkdir(parents=True, exist_ok=True)
+            extractor = DesignExtractor(url, viewport_width, viewport_height, browser, max_elements, breakpoints)
+            data = await extractor.extract_all(url_dir)
+            write_design_guide(data, url_dir)
 
 
 @click.command()
 @click.option(
     "--url", "-u",
     required=True,
-    help="URL of the website to analyze"
+    multiple=True,
+    help="URL of the website to analyze (repeat to analyze several with one browser)"
 )
 @click.option(
     "--output", "-o",
@@ -1132,7 +1462,22 @@ Follow the accessibility patterns identified in the analysis.
     show_default=True,
     help="Viewport height for screenshots"
 )
-def main(url, output, viewport_width, viewport_height):
+@click.option(
+    "--max-elements",
+    default=3000,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Maximum number of elements saved to computed_styles.json (evenly sampled beyond this)"
+)
+@click.option(
+    "--breakpoints", "-b",
+    multiple=True,
+    type=click.Choice([*BREAKPOINTS, 'none']),
+    default=tuple(BREAKPOINTS),
+    show_default=True,
+    help="Responsive breakpoint to capture (repeat for several; 'none' skips responsive capture)"
+)
+def main(url, output, viewport_width, viewport_height, max_elements, breakpoints):
     """
     Generate a comprehensive design guide from a website URL.
 
@@ -1150,35 +1495,17 @@ def main(url, output, viewport_width, viewport_height):
     Example:
       python main.py --url https://stripe.com
       python main.py -u https://github.com -o ./github-design
+      python main.py -u https://stripe.com -u https://github.com -o ./guides
+      python main.py -u https://stripe.com -b mobile -b desktop
     """
 
     output_dir = Path(output)
     output_dir.mkdir(parents=True, exist_ok=True)
 
     try:
-        # Extract comprehensive design information
-        extractor = DesignExtractor(url, viewport_width, viewport_height)
-        data = extractor.extract_all(output_dir)
-
-        # Generate comprehensive design guide
-        click.echo()
-        click.echo(click.style("📝 Generating comprehensive design guide...", fg="cyan", bold=True))
-        guide_content = generate_design_guide(data, output_dir)
-
-        # Save design guide
-        guide_path = output_dir / "design-guide.md"
-        guide_path.write_text(guide_content, encoding='utf-8')
-
-        click.echo()
-        click.echo(click.style("✅ Comprehensive design guide generated!", fg="green", bold=True))
-        click.echo()
-        click.echo(f"📁 Output directory: {click.style(str(output_dir.absolute()), fg='blue', bold=True)}")
-        click.echo(f"📄 Design guide: {click.style(str(guide_path.name), fg='blue')}")
-        click.echo(f"📊 Design data: {click.style('design_data.json', fg='blue')}")
-        click.echo(f"📸 Screenshots: {click.style('viewport, fullpage, responsive (mobile/tablet/desktop), hover states', fg='blue')}")
-        click.echo(f"📦 Extracted files: {click.style('HTML, CSS, computed styles', fg='blue')}")
-        click.echo()
-        click.echo(click.style("💡 Tip:", fg="yellow") + " View all assets with: cd " + str(output_dir) + " && python3 -m http.server 8080")
+        # Extract and write a comprehensive design guide for every URL
+        asyncio.run(generate_guides(list(url), output_dir, viewport_width, viewport_height, max_elements,
+                                    [name for name in breakpoints if name != 'none']))
 
     except Exception as e:
         click.echo()